@@ -0,0 +1,292 @@
+"""
+Benchmarks for quiz loading, board building, score bars, text fitting, reveal preparation,
+backdrops and cold start.
+
+Run from the repository root:
+    python -m benchmarks.benchmark [--output results.json] [--baseline benchmarks/baseline.json]
+
+Timings depend on the machine, so no baseline is shipped. The first run on a
+machine stores its results as the baseline, later runs are compared with it.
+
+The tkinter benchmarks need a display. If DISPLAY is not set and Xvfb is installed,
+a virtual display is started for the run, otherwise those benchmarks are skipped.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import statistics
+import tkinter as tk
+
+from PIL import Image, ImageTk
+
+from src.backdrop import TOLERANCE, difference, fast_backdrop, reference_backdrop
+from src.engine import GameEngine
+from src.game import Framework, Game, FONT, RESOLUTIONS, create_questions
+from src.layout import Layout
+from src.mediacache import REVEAL_SIZE, render_solution
+from src.questionboard import QuestionBoard
+from src.questionscreen import QuestionScreen
+from src.quizfile import compile_quiz
+from src.scores import PointHandler
+from src.textfit import TextFitter
+
+QUIZ_SIZES = [10, 100, 1000, 10000, 100000]
+IMAGE_SIZES = [(4000, 3000), (8000, 6000)]
+THRESHOLD = 0.2
+
+
+def measure(func, repeat=5):
+    """
+    Call func repeat times and return the minimum and median run time in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "runs": repeat}
+
+
+def write_quiz(path, rows, solution_file=""):
+    """
+    Write a synthetic quiz with the given number of rows.
+    """
+    with open(path, "w", encoding="utf-8", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["Question", "Answer A (Solution)", "Answer B", "Answer C", "Answer D",
+                         "Points", "Solution File"])
+        for row in range(rows):
+            writer.writerow([f"Question {row}?", f"right {row}", "wrong", "also wrong", "nope",
+                             50*(row % 5 + 1), solution_file if row % 10 == 0 else ""])
+
+
+def write_images(directory):
+    """
+    Write large synthetic JPEG and PNG images and return their paths.
+    """
+    paths = []
+    for width, height in IMAGE_SIZES:
+        img = Image.radial_gradient("L").resize((width, height)).convert("RGB")
+        for extension in ["jpg", "png"]:
+            path = os.path.join(directory, f"image_{width}x{height}.{extension}")
+            img.save(path)
+            paths.append(path)
+    return paths
+
+
+def bench_loading(directory, results):
+    """
+    Benchmark create_questions from csv files and from compiled quizzes.
+    """
+    for rows in QUIZ_SIZES:
+        path = os.path.join(directory, f"quiz_{rows}.csv")
+        write_quiz(path, rows, "solutions/square.jpg")
+        repeat = 3 if rows >= 10000 else 10
+        results[f"create_questions/csv/{rows}"] = measure(lambda: create_questions(path), repeat)
+        compile_quiz(path)
+        results[f"create_questions/compiled/{rows}"] = measure(lambda: create_questions(path),
+                                                               repeat)
+        os.remove(os.path.splitext(path)[0] + ".qwc")
+
+
+def bench_reveal(paths, results):
+    """
+    Benchmark the image preparation of Question.show_answer.
+    """
+    for path in paths:
+        for scale in [1, 2]:
+            results[f"show_answer/render/{os.path.basename(path)}/{scale}"] = measure(
+                lambda: render_solution(path, scale), 3)
+
+
+def bench_backdrop(paths, results):
+    """
+    Benchmark the reveal backdrop against the full resolution blur and check its difference.
+    """
+    for path in paths:
+        _, img = render_solution(path, 1)
+        for scale in [1, 2, 3]:
+            size = (int(REVEAL_SIZE[0]*scale), int(REVEAL_SIZE[1]*scale))
+            name = f"{os.path.basename(path)}/{scale}"
+            reference = reference_backdrop(img, size)
+            results[f"backdrop/reference/{name}"] = measure(
+                lambda: reference_backdrop(img, size), 3)
+            for method, use_numpy in [("pillow", False), ("numpy", True)]:
+                result = measure(lambda: fast_backdrop(img, size, use_numpy=use_numpy), 3)
+                result["difference"] = difference(reference,
+                                                  fast_backdrop(img, size, use_numpy=use_numpy))
+                if result["difference"] > TOLERANCE:
+                    print(f"backdrop/{method}/{name} differs by {result['difference']:.2f}")
+                results[f"backdrop/{method}/{name}"] = result
+
+
+def bench_tk(directory, paths, results):
+    """
+    Benchmark widget creation and cold start with tkinter.
+    """
+    quiz = os.path.join(directory, "board.csv")
+    write_quiz(quiz, 50)
+    root = tk.Tk()
+    framework = Framework.__new__(Framework)
+    framework.window = root
+    framework.game = Game.__new__(Game)
+    framework.game.framework = framework
+    framework.game.questions = create_questions(quiz)
+    framework.game.engine = GameEngine(framework.game.questions)
+
+    def clear():
+        for child in root.winfo_children():
+            child.destroy()
+
+    for width, height in RESOLUTIONS:
+        framework.set_resolution(width, height)
+        framework.layout = Layout(root, framework.scale, framework.offset,
+                                  framework.fit_window, FONT)
+        framework.backgrounds = {}
+
+        def board():
+            QuestionBoard(framework, framework.game.questions)
+            root.update_idletasks()
+            clear()
+
+        def points():
+            PointHandler(framework)
+            root.update_idletasks()
+            clear()
+
+        def toggle():
+            question_board.hide_buttons()
+            root.update_idletasks()
+            question_board.show_buttons()
+            root.update_idletasks()
+
+        def fit_texts():
+            screen.fitter = TextFitter(framework.layout)
+            screen.prepare(framework.game.questions)
+
+        results[f"create_question_buttons/{width}x{height}"] = measure(board)
+        results[f"create_points/{width}x{height}"] = measure(points)
+        screen = QuestionScreen(framework)
+        results[f"fit_texts/{width}x{height}"] = measure(fit_texts)
+        question_board = QuestionBoard(framework, framework.game.questions)
+        results[f"board_toggle/{width}x{height}"] = measure(toggle, 20)
+        clear()
+
+    for path in paths:
+        for scale in [1, 2]:
+            background, foreground = render_solution(path, scale)
+            results[f"show_answer/photoimage/{os.path.basename(path)}/{scale}"] = measure(
+                lambda: (ImageTk.PhotoImage(background), ImageTk.PhotoImage(foreground)), 3)
+    root.destroy()
+
+    def cold_start():
+        game = Framework(quiz=quiz, resolution=(1920, 1080), mainloop=False)
+        game.window.update()
+        game.window.destroy()
+
+    try:
+        results["framework_init/1920x1080"] = measure(cold_start, 3)
+    except (OSError, NameError, tk.TclError) as error:
+        print(f"Skipping cold start: {error}")
+
+
+def start_display():
+    """
+    Make sure a display is available, starting Xvfb if needed.
+    Returns the Xvfb process, True if a display already exists or None.
+    """
+    if os.environ.get("DISPLAY"):
+        return True
+    if not shutil.which("Xvfb"):
+        return None
+    display = ":97"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1920x1080x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1)
+    os.environ["DISPLAY"] = display
+    return process
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Return the benchmarks whose median is slower than the baseline by more than threshold.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median"]/max(baseline[name]["median"], 1e-9)
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main():
+    """
+    Run all benchmarks, write the results and compare them with the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark quiz_wall.")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="file to write the results to")
+    parser.add_argument("--baseline", default=os.path.join("benchmarks", "baseline.json"),
+                        help="results to compare with, created by the first run if missing")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="allowed slowdown compared to the baseline, 0.2 means 20 %%")
+    parser.add_argument("--no-tk", action="store_true", help="skip benchmarks that need tkinter")
+    args = parser.parse_args()
+
+    results = {}
+    directory = tempfile.mkdtemp(prefix="quiz_wall_bench")
+    try:
+        paths = write_images(directory)
+        bench_loading(directory, results)
+        bench_reveal(paths, results)
+        bench_backdrop(paths, results)
+        display = None if args.no_tk else start_display()
+        if display:
+            bench_tk(directory, paths, results)
+            if display is not True:
+                display.terminate()
+        else:
+            print("No display available, skipping tkinter benchmarks.")
+    finally:
+        shutil.rmtree(directory)
+
+    report = {"meta": {"python": sys.version.split()[0], "platform": platform.platform(),
+                       "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+              "results": results}
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    for name, result in results.items():
+        print(f"{name:60} {1000*result['median']:10.2f} ms")
+
+    if args.update_baseline:
+        shutil.copy(args.output, args.baseline)
+        return 0
+    try:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+    except FileNotFoundError:
+        shutil.copy(args.output, args.baseline)
+        print(f"No baseline at {args.baseline}, these results are stored as the baseline. "
+              f"Nothing was compared.")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, ratio in regressions:
+        print(f"REGRESSION {name}: {ratio:.2f}x baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
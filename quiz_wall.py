@@ -1,8 +1,187 @@
 """
 Initialize and start a quiz.
+
+Modules only needed by the other commands are imported when they are used,
+to keep them off the startup of the game.
 """
 
-from src.game import Framework
+import time
+
+STARTED = time.perf_counter()
+
+# pylint: disable=wrong-import-position,import-outside-toplevel
+import os
+import sys
+import random
+import argparse
+
+from src.assetcache import ASSET_CACHE, scaled_size
+from src.game import Framework, RESOLUTIONS, create_questions, get_resolution
+from src.client import HOST, PORT, BUZZER_PORT, parse_address, server_stats
+from src.quizfile import compile_quiz, pack_quiz
+from src.recorder import RECORDER
+from src.startup import STARTUP
+
+
+def parse_resolution(text):
+    """
+    Parse a resolution like 1920x1080.
+    """
+    try:
+        width, height = [int(f) for f in text.split("x")]
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid resolution {text!r}") from error
+    return width, height
+
+
+def positive_int(text):
+    """
+    Parse a count that must be at least 1.
+    """
+    try:
+        value = int(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid count {text!r}") from error
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"count must be at least 1, not {value}")
+    return value
+
+
+def parse_args():
+    """
+    Parse the command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="A simple quiz game for two teams.")
+    parser.add_argument("quiz", nargs="?", help="quiz to start without the selection screen")
+    parser.add_argument("--resolution", type=parse_resolution, metavar="WIDTHxHEIGHT",
+                        help="screen resolution to use for the quiz given on the command line")
+    parser.add_argument("--pregenerate-backgrounds", action="store_true",
+                        help="scale the gameplay backgrounds for every supported resolution")
+    parser.add_argument("--compile", nargs="+", metavar="QUIZ",
+                        help="validate quiz csv files and write their compiled .qwc version")
+    parser.add_argument("--pack", nargs="+", metavar="QUIZ",
+                        help="write quiz csv files with their solution files into .qwp packs")
+    parser.add_argument("--prepare", nargs="+", metavar="QUIZ",
+                        help="render the solution images of quizzes for --resolution ahead of time")
+    parser.add_argument("--workers", type=int,
+                        help="number of processes used by --prepare, all cores by default")
+    parser.add_argument("--quiz-dir", action="append", metavar="DIR",
+                        help="directory to search for quizzes, can be given multiple times")
+    parser.add_argument("--simulate", metavar="QUIZ",
+                        help="play randomized games of a quiz without a display")
+    parser.add_argument("--games", type=positive_int, default=1000,
+                        help="number of games to simulate or to play per room in the load test")
+    parser.add_argument("--skill", type=float, nargs=2, default=[0.5, 0.5],
+                        metavar=("BLUE", "RED"),
+                        help="chance of each team to choose the correct answer")
+    parser.add_argument("--seed", type=int, help="seed for the simulated games")
+    parser.add_argument("--server", action="store_true",
+                        help="host quiz rooms for display clients instead of playing")
+    parser.add_argument("--host", default=HOST, help="address the server listens on")
+    parser.add_argument("--port", type=int, default=PORT, help="port the server listens on")
+    parser.add_argument("--connect", type=parse_address, metavar="HOST:PORT",
+                        help="play the quiz in a room of a quiz server")
+    parser.add_argument("--room", default="main", help="room to join on the quiz server")
+    parser.add_argument("--load-test", metavar="QUIZ",
+                        help="play randomized games in many rooms of the server at --connect")
+    parser.add_argument("--stats", action="store_true",
+                        help="print latency and memory of the rooms of the server at --connect")
+    parser.add_argument("--rooms", type=int, default=24,
+                        help="number of rooms to play in during the load test")
+    parser.add_argument("--new-game", action="store_true",
+                        help="start a new game instead of resuming an interrupted one")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record the actions of a new game to replay them later")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay a recording as fast as possible and time every step")
+    parser.add_argument("--runs", type=positive_int, default=3,
+                        help="number of replays, the median time of every step is used")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store the step times of the replay as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown of a replayed step, 0.2 means 20 %%")
+    parser.add_argument("--buzzer", type=int, nargs="?", const=BUZZER_PORT, metavar="PORT",
+                        help="let the teams buzz in over UDP, on port %(const)s by default")
+    parser.add_argument("--buzzer-load", type=positive_int, metavar="CLIENTS",
+                        help="measure the buzzers with many simulated buzzers on localhost")
+    parser.add_argument("--buzzer-rounds", type=positive_int, default=20,
+                        help="questions buzzed in for with --buzzer-load")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print where the time until the first screen is spent and exit")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    GAME = Framework()
+    ARGS = parse_args()
+    if ARGS.pregenerate_backgrounds:
+        ASSET_CACHE.pregenerate([scaled_size(get_resolution(width, height))
+                                 for width, height in RESOLUTIONS])
+    elif ARGS.compile:
+        for QUIZ in ARGS.compile:
+            print(f"{QUIZ} -> {compile_quiz(QUIZ)}")
+    elif ARGS.pack:
+        for QUIZ in ARGS.pack:
+            print(f"{QUIZ} -> {pack_quiz(QUIZ)}")
+    elif ARGS.prepare:
+        from src.renditions import prepare_quiz
+        SCALE = get_resolution(*(ARGS.resolution or (1920, 1080)))
+        for QUIZ in ARGS.prepare:
+            START = time.perf_counter()
+            FOLDER, REPORT = prepare_quiz(QUIZ, SCALE, ARGS.workers)
+            for PATH, STATUS, _ in REPORT:
+                print(f"{PATH:50} {STATUS}")
+            RENDERED = [SECONDS for _, STATUS, SECONDS in REPORT if STATUS.startswith("rendered")]
+            print(f"{QUIZ} -> {FOLDER}: {len(RENDERED)} rendered, "
+                  f"{len(REPORT) - len(RENDERED)} skipped or failed, "
+                  f"{sum(RENDERED):.1f} s of work in {time.perf_counter() - START:.1f} s")
+    elif ARGS.replay:
+        from src.replay import run_replay
+        sys.exit(run_replay(ARGS.replay, update=ARGS.update_baseline, threshold=ARGS.threshold,
+                            runs=ARGS.runs, resolution=ARGS.resolution, quiz_dirs=ARGS.quiz_dir))
+    elif ARGS.simulate:
+        from src.simulator import simulate, print_report
+        print_report(simulate(create_questions(ARGS.simulate), ARGS.games, ARGS.skill, ARGS.seed))
+    elif ARGS.server:
+        from src.server import run_server
+        run_server(ARGS.host, ARGS.port)
+    elif ARGS.stats:
+        STATS = server_stats(ARGS.connect or (ARGS.host, ARGS.port))
+        for NAME, ROOM in STATS["rooms"].items():
+            print(f"{NAME:20} {ROOM['clients']:3} clients {ROOM['commands']:7} commands  "
+                  f"p50 {ROOM['latency_p50']:.3f} ms  p95 {ROOM['latency_p95']:.3f} ms  "
+                  f"{ROOM['memory']/1024:.1f} kB")
+        print(f"{len(STATS['quizzes'])} shared quizzes, peak memory {STATS['max_rss']} kB")
+    elif ARGS.buzzer_load:
+        import asyncio
+        from src.buzzer import buzzer_load
+        RESULT = asyncio.run(buzzer_load(ARGS.buzzer_load, ARGS.buzzer_rounds, ARGS.seed))
+        LATENCY, ACKS = RESULT["latency"], RESULT["acks"]
+        print(f"{ARGS.buzzer_load} buzzers, {RESULT['correct']}/{RESULT['rounds']} "
+              f"questions to the team that pressed first, "
+              f"clock offsets within {1000*RESULT['offset_error']:.2f} ms")
+        print(f"press to decision p50 {1000*LATENCY[len(LATENCY)//2]:.2f} ms, "
+              f"p95 {1000*LATENCY[int(len(LATENCY)*0.95)]:.2f} ms, "
+              f"max {1000*LATENCY[-1]:.2f} ms")
+        print(f"{len(ACKS)} presses acknowledged, p50 {1000*ACKS[len(ACKS)//2]:.2f} ms, "
+              f"p95 {1000*ACKS[int(len(ACKS)*0.95)]:.2f} ms")
+    elif ARGS.load_test:
+        import asyncio
+        from src.server import load_test
+        LATENCY = asyncio.run(load_test(ARGS.connect or (ARGS.host, ARGS.port),
+                                        os.path.abspath(ARGS.load_test), ARGS.rooms,
+                                        ARGS.games, ARGS.seed))
+        print(f"{len(LATENCY)} requests in {ARGS.rooms} rooms, "
+              f"p50 {1000*LATENCY[len(LATENCY)//2]:.2f} ms, "
+              f"p95 {1000*LATENCY[int(len(LATENCY)*0.95)]:.2f} ms, "
+              f"max {1000*LATENCY[-1]:.2f} ms")
+    else:
+        if ARGS.profile_startup:
+            STARTUP.enable(STARTED)
+        if ARGS.record:
+            # a replay starts from the same shuffled answers with a new game
+            SEED = ARGS.seed if ARGS.seed is not None else random.randrange(2**32)
+            random.seed(SEED)
+            RECORDER.enable(ARGS.record, SEED, ARGS.resolution)
+        SERVER = (ARGS.connect, ARGS.room) if ARGS.connect else None
+        GAME = Framework(ARGS.quiz_dir, ARGS.quiz, ARGS.resolution, server=SERVER,
+                         buzzer=ARGS.buzzer, resume=not (ARGS.new_game or ARGS.record))
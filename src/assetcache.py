@@ -0,0 +1,105 @@
+"""
+Persistent on-disk cache of scaled gameplay images.
+"""
+
+import os
+import hashlib
+
+from PIL import Image
+
+CACHE_DIR = ".cache"
+BACKGROUNDS = ["gameplay/hintergrund.jpg", "gameplay/hintergrund2.png"]
+
+
+class AssetCache:
+    """
+    Stores scaled copies of images keyed by source hash and target size.
+    """
+    def __init__(self, directory=os.path.join(CACHE_DIR, "assets")):
+        self.directory = directory
+        self.hashes = {}
+
+    def get(self, path, size):
+        """
+        Return the image scaled to size, scaling and storing it on a miss.
+        """
+        digest = self.source_hash(path)
+        target = self.entry_path(path, digest, size)
+        try:
+            img = Image.open(target)
+            img.load()
+            return img
+        except OSError:
+            pass
+
+        img = Image.open(path).resize(size, Image.ANTIALIAS)
+        try:
+            self.store(img, target)
+            self.prune(path, digest)
+        except OSError as error:
+            print(f"Could not cache {path}: {error}")
+        return img
+
+    def source_hash(self, path):
+        """
+        Hash the content of a source file, reusing the hash while the file is unchanged.
+        """
+        stat = os.stat(path)
+        known = self.hashes.get(path)
+        if known and known[0] == (stat.st_size, stat.st_mtime_ns):
+            return known[1]
+
+        with open(path, "rb") as source:
+            digest = hashlib.sha1(source.read()).hexdigest()[:16]
+        self.hashes[path] = ((stat.st_size, stat.st_mtime_ns), digest)
+        return digest
+
+    def entry_path(self, path, digest, size):
+        """
+        Return the cache file for a source at a given size.
+        """
+        stem, ext = os.path.splitext(os.path.basename(path))
+        return os.path.join(self.directory, f"{stem}-{digest}-{size[0]}x{size[1]}{ext}")
+
+    def store(self, img, target):
+        """
+        Write an image to the cache without leaving partial files behind.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temp = target + ".tmp"
+        if target.lower().endswith(".png"):
+            img.save(temp, format="PNG", compress_level=1)
+        else:
+            img.convert("RGB").save(temp, format="JPEG", quality=95)
+        os.replace(temp, target)
+
+    def prune(self, path, digest):
+        """
+        Remove cached copies of a source that were made from an older version of it.
+        """
+        stem, ext = os.path.splitext(os.path.basename(path))
+        for entry in os.listdir(self.directory):
+            if not entry.startswith(stem + "-") or not entry.endswith(ext):
+                continue
+            parts = entry[len(stem)+1:-len(ext)].split("-")
+            if len(parts) == 2 and parts[0] != digest:
+                os.remove(os.path.join(self.directory, entry))
+
+    def pregenerate(self, sizes, paths=None):
+        """
+        Create the cache entries for all sizes ahead of time.
+        """
+        for path in paths or BACKGROUNDS:
+            for size in sizes:
+                self.get(path, size)
+                print(f"{path} {size[0]}x{size[1]}")
+
+
+def scaled_size(scale):
+    """
+    Return the size of a full screen image at the given scale.
+    """
+    return (int(1920*scale), int(1080*scale))
+
+
+ASSET_CACHE = AssetCache()
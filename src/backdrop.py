@@ -0,0 +1,85 @@
+"""
+Blurred backdrops behind revealed solution images.
+"""
+
+import math
+
+from PIL import Image, ImageChops, ImageFilter, ImageStat
+
+BLUR_RADIUS = 10
+WORK_RADIUS = 2.5
+BOX_PASSES = 3
+TOLERANCE = 4
+
+
+def reference_backdrop(img, size, radius=BLUR_RADIUS):
+    """
+    Scale an image to size and blur it at full resolution.
+    """
+    return img.resize(size, Image.ANTIALIAS).filter(ImageFilter.GaussianBlur(radius=radius))
+
+
+def fast_backdrop(img, size, radius=BLUR_RADIUS, use_numpy=False):
+    """
+    Blur an image at a reduced working resolution and scale the result up to size.
+    The blur removes all detail the working resolution drops, so the result looks
+    like reference_backdrop. With use_numpy the blur is done with NumPy if it is installed.
+    """
+    factor = max(1, radius/WORK_RADIUS)
+    work_size = (max(1, round(size[0]/factor)), max(1, round(size[1]/factor)))
+    if img.mode not in ("L", "RGB", "RGBA"):
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+    small = img.resize(work_size, Image.BOX)
+    if use_numpy and load_numpy():
+        small = box_blur(small, radius/factor)
+    else:
+        small = small.filter(ImageFilter.GaussianBlur(radius=radius/factor))
+    return small.resize(size, Image.BILINEAR)
+
+
+def box_blur(img, sigma, passes=BOX_PASSES):
+    """
+    Approximate a gaussian blur with repeated box blurs on a NumPy array.
+    """
+    numpy = load_numpy()
+    width = max(1, round(math.sqrt(12*sigma*sigma/passes + 1)))
+    data = numpy.asarray(img, dtype=numpy.float32)
+    for _ in range(2):
+        for _ in range(passes):
+            data = box_blur_rows(data, width)
+        data = data.swapaxes(0, 1)
+    return Image.fromarray(numpy.clip(data + 0.5, 0, 255).astype(numpy.uint8), img.mode)
+
+
+def box_blur_rows(data, width):
+    """
+    Average every value with its neighbours along the first axis, repeating the edges.
+    """
+    numpy = load_numpy()
+    before = (width - 1)//2
+    after = width - 1 - before
+    pad = [(before + 1, after)] + [(0, 0)]*(data.ndim - 1)
+    # running sums over the padded data give every window with one subtraction
+    sums = numpy.cumsum(numpy.pad(data, pad, mode="edge"), axis=0)
+    sums[0] = 0
+    return (sums[width:] - sums[:-width])/width
+
+
+def load_numpy():
+    """
+    Import NumPy on first use, it takes longer than starting the game without it.
+    Returns None if it is not installed.
+    """
+    try:
+        import numpy # pylint: disable=import-outside-toplevel
+    except ImportError: # the backdrop is blurred with Pillow only
+        return None
+    return numpy
+
+
+def difference(first, second):
+    """
+    Return the mean absolute difference of two images of the same size per channel value.
+    """
+    diff = ImageChops.difference(first.convert("RGB"), second.convert("RGB"))
+    return sum(ImageStat.Stat(diff).mean)/3
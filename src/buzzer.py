@@ -0,0 +1,428 @@
+"""
+Buzzers that let the teams take a question from phones or microcontrollers on the local network.
+
+Buzzers send json datagrams over UDP. A press looks like
+    {"t": "press", "id": "phone-3", "team": "red", "seq": 7, "at": 1234.567, "answer": 2}
+where at is the time of the press on the buzzer's own clock in seconds and the
+answer is optional. Every press is acknowledged with {"t": "ack", "seq": 7} and
+should be sent again until it is. The server pings every buzzer with
+{"t": "ping", "s": <server time>} and a buzzer answers with
+{"t": "pong", "id": "phone-3", "s": <the same value>, "at": <its own time>},
+from which the offset of its clock is estimated like NTP, using the ping with
+the shortest round trip. Presses are ordered by their time on the server clock,
+so a buzzer on a slower network does not lose against a later press.
+"""
+
+import json
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+
+from src.client import BUZZER_PORT
+from src.tracing import TRACER
+from src.wakeup import Wakeup
+
+TEAMS = ["blue", "red"]
+COLLECT_WINDOW = 0.02
+TIE_WINDOW = 0.002
+PING_EVERY = 2
+SAMPLES = 16
+STALE = 60
+# how often results are checked for where tkinter can not be woken up by a pipe
+POLL_INTERVAL = 50
+
+
+class Buzzer:
+    """
+    Address and clock offset of one buzzer.
+    """
+    def __init__(self, address, now):
+        self.address = address
+        self.last_seen = now
+        self.samples = deque(maxlen=SAMPLES)
+        self.seen = deque(maxlen=64)
+
+    def add_sample(self, sent, at, arrival):
+        """
+        Add the round trip of a ping sent at sent and answered at at on the buzzer clock.
+        """
+        self.samples.append((arrival - sent, (sent + arrival)/2 - at))
+
+    def offset(self):
+        """
+        Return the offset from the buzzer clock to the server clock, or None if unknown.
+        """
+        return min(self.samples)[1] if self.samples else None
+
+    def server_time(self, at, arrival):
+        """
+        Return the time of a press on the server clock. Without a known offset the
+        arrival is used, a press never counts later than it arrived.
+        """
+        offset = self.offset()
+        if at is None or offset is None:
+            return arrival
+        return min(arrival, at + offset)
+
+
+class BuzzerServer(asyncio.DatagramProtocol):
+    """
+    Collects the presses of all buzzers while a question is open and decides which
+    team was first. on_buzz is called on the event loop with team, answer and the
+    time of the press on the clock of the event loop.
+    """
+    def __init__(self, on_buzz, collect=COLLECT_WINDOW, tie=TIE_WINDOW, ping_every=PING_EVERY):
+        self.on_buzz = on_buzz
+        self.collect = collect
+        self.tie = tie
+        self.ping_every = ping_every
+        self.buzzers = {}
+        self.presses = []
+        self.armed = None
+        self.decision = None
+        self.last_tie = None
+        self.pinging = None
+        self.transport = None
+        self.loop = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.loop = asyncio.get_running_loop()
+        self.pinging = self.loop.call_later(self.ping_every, self.ping_all)
+
+    def connection_lost(self, exc):
+        self.disarm()
+        if self.pinging:
+            self.pinging.cancel()
+
+    def datagram_received(self, data, address):
+        arrival = self.loop.time()
+        try:
+            message = json.loads(data)
+            kind = message["t"]
+            name = str(message["id"])
+        except (ValueError, KeyError, TypeError):
+            return
+        buzzer = self.buzzers.get(name)
+        if buzzer is None:
+            buzzer = self.buzzers[name] = Buzzer(address, arrival)
+            self.ping(buzzer)
+        buzzer.address = address
+        buzzer.last_seen = arrival
+        try:
+            if kind == "pong":
+                buzzer.add_sample(float(message["s"]), float(message["at"]), arrival)
+            elif kind == "press":
+                self.press(buzzer, name, message, arrival)
+        except (ValueError, KeyError, TypeError):
+            pass
+
+    def press(self, buzzer, name, message, arrival):
+        """
+        Acknowledge a press and keep it if a question is open.
+        """
+        seq = message["seq"]
+        self.send({"t": "ack", "seq": seq}, buzzer.address)
+        if seq in buzzer.seen:
+            return
+        buzzer.seen.append(seq)
+        if self.armed is None or message.get("team") not in TEAMS:
+            return
+        at = message.get("at")
+        pressed = buzzer.server_time(None if at is None else float(at), arrival)
+        if pressed < self.armed: # pressed before the question was shown
+            return
+        answer = message.get("answer")
+        if not isinstance(answer, int) or isinstance(answer, bool) or not 0 <= answer < 4:
+            answer = None
+        self.presses.append((pressed, arrival, message["team"], answer, name))
+        if self.decision is None:
+            # later presses may still arrive from buzzers with a slower network
+            self.decision = self.loop.call_later(self.collect, self.decide)
+
+    def decide(self):
+        """
+        Give the question to the team with the first press. Presses within the tie
+        window count as simultaneous, ties between the teams go to them in turn.
+        """
+        self.decision = None
+        if self.armed is None or not self.presses:
+            return
+        first = min(press[0] for press in self.presses)
+        tied = [press for press in self.presses if press[0] - first <= self.tie]
+        if len({press[2] for press in tied}) > 1:
+            team = "red" if self.last_tie == "blue" else "blue"
+            self.last_tie = team
+        else:
+            team = tied[0][2]
+        press = min(press for press in tied if press[2] == team)
+        self.armed = None
+        self.presses = []
+        for buzzer in self.buzzers.values():
+            self.send({"t": "result", "team": team, "id": press[4]}, buzzer.address)
+        self.on_buzz(team, press[3], press[0])
+
+    def arm(self):
+        """
+        Accept presses from now on, for a question that was just shown.
+        """
+        self.disarm()
+        self.armed = self.loop.time()
+
+    def disarm(self):
+        """
+        Stop accepting presses and drop the ones that were not decided yet.
+        """
+        self.armed = None
+        self.presses = []
+        if self.decision:
+            self.decision.cancel()
+            self.decision = None
+
+    def ping(self, buzzer):
+        """
+        Ping a buzzer to measure the offset of its clock.
+        """
+        self.send({"t": "ping", "s": self.loop.time()}, buzzer.address)
+
+    def ping_all(self):
+        """
+        Ping all buzzers and forget the ones that were not heard from for a while.
+        """
+        now = self.loop.time()
+        for name, buzzer in list(self.buzzers.items()):
+            if now - buzzer.last_seen > STALE:
+                del self.buzzers[name]
+            else:
+                self.ping(buzzer)
+        self.pinging = self.loop.call_later(self.ping_every, self.ping_all)
+
+    def send(self, message, address):
+        """
+        Send a message to a buzzer.
+        """
+        self.transport.sendto(json.dumps(message).encode("utf-8"), address)
+
+
+class BuzzerInput:
+    """
+    Runs a buzzer server on a background event loop and hands the team that
+    buzzed first to callback on the tkinter thread. The event loop only stores
+    the result and wakes the tkinter thread with Wakeup, as calling into tkinter
+    from another thread can block or fail. Every question gets a new
+    generation, so a result of an earlier question is dropped.
+    """
+    def __init__(self, window, callback, host="0.0.0.0", port=BUZZER_PORT):
+        self.window = window
+        self.callback = callback
+        self.lock = threading.Lock()
+        self.result = None
+        self.generation = 0
+        self.server_generation = 0
+        self.armed = False
+        self.wakeup = Wakeup(window, self.handle, POLL_INTERVAL, lambda: self.armed)
+        self.latency = deque(maxlen=1000)
+        self.loop = asyncio.new_event_loop()
+        self.server = BuzzerServer(self.buzzed)
+        self.thread = threading.Thread(target=self.run, args=(host, port), daemon=True)
+        self.thread.start()
+
+    def run(self, host, port):
+        """
+        Listen for buzzers until the program ends. Runs in the background thread.
+        """
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.loop.create_datagram_endpoint(
+                lambda: self.server, local_addr=(host, port)))
+        except OSError as error:
+            print(f"Could not listen for buzzers on {host}:{port}: {error}")
+            return
+        self.loop.run_forever()
+
+    def arm(self):
+        """
+        Accept presses for the question that was just shown and wait for the result.
+        """
+        self.generation += 1
+        self.armed = True
+        self.loop.call_soon_threadsafe(self.arm_server, self.generation)
+        self.wakeup.watch()
+
+    def arm_server(self, generation):
+        """
+        Arm the server for a generation. Called on the event loop.
+        """
+        self.server_generation = generation
+        self.server.arm()
+
+    def disarm(self):
+        """
+        Stop accepting presses.
+        """
+        self.generation += 1
+        self.armed = False
+        self.loop.call_soon_threadsafe(self.server.disarm)
+
+    def buzzed(self, team, answer, pressed):
+        """
+        Keep a result for the tkinter thread and wake it up. Called on the event loop.
+        """
+        with self.lock:
+            self.result = (self.server_generation, team, answer, pressed)
+        self.wakeup.wake()
+
+    def handle(self):
+        """
+        Pass a result of the open question to the callback, on the tkinter thread.
+        """
+        with self.lock:
+            result, self.result = self.result, None
+        if result and result[0] == self.generation and self.armed:
+            # the server decides once per question
+            self.armed = False
+            self.callback(*result[1:])
+
+    def shown(self, pressed):
+        """
+        Record the time from a press until its result is on screen. The press
+        time is on the clock of the event loop, which is time.monotonic.
+        """
+        latency = time.monotonic() - pressed
+        self.latency.append(latency)
+        if TRACER.enabled:
+            now = time.perf_counter()
+            TRACER.complete("buzz", now - latency, now)
+
+    def report(self):
+        """
+        Return a summary of the times from press to screen, or None without buzzes.
+        """
+        if not self.latency:
+            return None
+        latency = sorted(self.latency)
+        return (f"{len(latency)} buzzes, press to screen "
+                f"p50 {1000*latency[len(latency)//2]:.1f} ms, "
+                f"p95 {1000*latency[int(len(latency)*0.95)]:.1f} ms, max {1000*latency[-1]:.1f} ms")
+
+
+class SimulatedBuzzer(asyncio.DatagramProtocol):
+    """
+    Buzzer with its own clock and a network delay, used by the load generator.
+    """
+    def __init__(self, name, team, offset, delay, jitter, rng):
+        self.name = name
+        self.team = team
+        self.offset = offset
+        self.delay = delay
+        self.jitter = jitter
+        self.rng = rng
+        self.seq = 0
+        self.pressed = None
+        self.sent = {}
+        self.acks = []
+        self.transport = None
+        self.loop = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.loop = asyncio.get_running_loop()
+        self.send({"t": "hello", "id": self.name})
+
+    def clock(self):
+        """
+        Return the time on the clock of the buzzer.
+        """
+        return self.loop.time() + self.offset
+
+    def network(self):
+        """
+        Return the delay of one message over the simulated network.
+        """
+        return self.delay + self.rng.uniform(0, self.jitter)
+
+    def send(self, message):
+        """
+        Send a message after the network delay.
+        """
+        data = json.dumps(message).encode("utf-8")
+        self.loop.call_later(self.network(), self.transport.sendto, data)
+
+    def datagram_received(self, data, _):
+        message = json.loads(data)
+        if message["t"] == "ping":
+            self.loop.call_later(self.network(), self.pong, message["s"])
+        elif message["t"] == "ack" and message["seq"] in self.sent:
+            self.acks.append(time.perf_counter() - self.sent.pop(message["seq"]))
+
+    def pong(self, sent):
+        """
+        Answer a ping once it has arrived over the simulated network.
+        """
+        self.send({"t": "pong", "id": self.name, "s": sent, "at": self.clock()})
+
+    def press(self):
+        """
+        Press the buzzer.
+        """
+        self.seq += 1
+        self.pressed = time.perf_counter()
+        self.sent[self.seq] = self.pressed
+        self.send({"t": "press", "id": self.name, "team": self.team, "seq": self.seq,
+                   "at": self.clock()})
+
+
+async def buzzer_load(clients=200, rounds=20, seed=None, max_delay=0.01, jitter=0.002):
+    """
+    Let many simulated buzzers with random clocks and network delays press in
+    every round and return the latency from the first press to the decision,
+    whether the right team got the question, the press acknowledgement times
+    and the largest error of the estimated clock offsets. The time until the
+    decision is on screen needs the game window, the game reports it with
+    BuzzerInput.report.
+    """
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+    server = BuzzerServer(None, ping_every=0.2)
+    transport, _ = await loop.create_datagram_endpoint(lambda: server,
+                                                       local_addr=("127.0.0.1", 0))
+    buzzers = []
+    transports = [transport]
+    for index in range(clients):
+        buzzer = SimulatedBuzzer(f"sim{index}", TEAMS[index % 2], rng.uniform(-60, 60),
+                                 rng.uniform(0, max_delay), jitter, random.Random(rng.random()))
+        endpoint, _ = await loop.create_datagram_endpoint(
+            lambda buzzer=buzzer: buzzer, remote_addr=transport.get_extra_info("sockname"))
+        transports.append(endpoint)
+        buzzers.append(buzzer)
+    # let the server collect a few pings of every buzzer
+    await asyncio.sleep(1)
+
+    latency = []
+    correct = 0
+    for _ in range(rounds):
+        decided = loop.create_future()
+        server.on_buzz = lambda team, answer, arrival, decided=decided: (
+            decided.done() or decided.set_result((team, time.perf_counter())))
+        server.arm()
+        for buzzer in buzzers:
+            loop.call_later(rng.uniform(0.05, 0.3), buzzer.press)
+        team, decided_at = await asyncio.wait_for(decided, 5)
+        # wait for the late presses before the next question
+        await asyncio.sleep(0.3 + max_delay + jitter)
+        server.disarm()
+        first = {name: min(buzzer.pressed for buzzer in buzzers if buzzer.team == name)
+                 for name in TEAMS}
+        winner = min(first, key=first.get)
+        latency.append(decided_at - first[winner])
+        if team == winner or abs(first["blue"] - first["red"]) <= server.tie:
+            correct += 1
+
+    errors = [abs(server.buzzers[buzzer.name].offset() + buzzer.offset) for buzzer in buzzers]
+    for endpoint in transports:
+        endpoint.close()
+    return {"latency": sorted(latency), "correct": correct, "rounds": rounds,
+            "acks": sorted(ack for buzzer in buzzers for ack in buzzer.acks),
+            "offset_error": max(errors)}
@@ -0,0 +1,117 @@
+"""
+Catalog of all available quizzes with cached metadata.
+"""
+
+import os
+import json
+
+from src.assetcache import CACHE_DIR
+from src.quizfile import read_rows
+from src.quizpack import PACK_EXTENSION
+
+
+class QuizCatalog:
+    """
+    Recursively scans directories for quizzes and caches their metadata by mtime.
+    """
+    def __init__(self, directories, index=os.path.join(CACHE_DIR, "catalog.json")):
+        self.directories = directories
+        self.index = index
+        self.entries = {}
+        try:
+            with open(self.index, encoding="utf-8") as index_file:
+                self.entries = json.load(index_file)
+        except (OSError, ValueError):
+            pass
+
+    def refresh(self):
+        """
+        Update the catalog, only reading quizzes that are new or changed.
+        """
+        entries = {}
+        changed = False
+        for path, stat in self.scan():
+            entry = self.entries.get(path)
+            if not entry or entry["stat"] != [stat.st_size, stat.st_mtime_ns]:
+                entry = read_metadata(path)
+                entry["stat"] = [stat.st_size, stat.st_mtime_ns]
+                changed = True
+            entries[path] = entry
+
+        changed = changed or len(entries) != len(self.entries)
+        self.entries = entries
+        if changed:
+            self.save()
+        return self.quizzes()
+
+    def scan(self):
+        """
+        Yield the path and stat of every quiz in the directories.
+        """
+        pending = list(self.directories)
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as scan:
+                    for entry in scan:
+                        if entry.name.startswith(".") or entry.name == "__pycache__":
+                            continue
+                        if entry.is_dir():
+                            pending.append(entry.path)
+                        elif entry.name.lower().endswith((".csv", PACK_EXTENSION)):
+                            yield os.path.normpath(entry.path), entry.stat()
+            except OSError as error:
+                print(f"Could not scan {directory}: {error}")
+
+    def save(self):
+        """
+        Write the cached metadata to the index file.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.index), exist_ok=True)
+            with open(self.index + ".tmp", "w", encoding="utf-8") as index_file:
+                json.dump(self.entries, index_file)
+            os.replace(self.index + ".tmp", self.index)
+        except OSError as error:
+            print(f"Could not save quiz catalog: {error}")
+
+    def quizzes(self):
+        """
+        Return the paths of all quizzes sorted by title.
+        """
+        return sorted(self.entries, key=lambda path: (self.entries[path]["title"].lower(), path))
+
+    def search(self, text):
+        """
+        Return the quizzes whose title or path contains all words of the text.
+        """
+        words = text.lower().split()
+        return [path for path in self.quizzes()
+                if all(word in path.lower() for word in words)]
+
+
+def read_metadata(path):
+    """
+    Read the title, question count, point categories, total points and media of a quiz.
+    """
+    entry = {"title": quiz_title(path), "questions": 0, "categories": [], "points": 0,
+             "media": False, "error": None}
+    categories = set()
+    try:
+        for row in read_rows(path):
+            points = int(row[5])
+            categories.add(points)
+            entry["questions"] += 1
+            entry["points"] += points
+            entry["media"] = entry["media"] or bool(row[6])
+    except (OSError, ValueError) as error:
+        entry["error"] = str(error)
+    entry["categories"] = sorted(categories)
+    return entry
+
+
+def quiz_title(path):
+    """
+    Return the title of a quiz from its file name.
+    """
+    return os.path.splitext(os.path.basename(path))[0]
@@ -0,0 +1,93 @@
+"""
+Display client that plays a game hosted by a quiz server.
+"""
+
+import os
+import json
+import socket
+
+from src.engine import GameEngine
+
+HOST = "127.0.0.1"
+PORT = 8765
+# listened on by the buzzers, kept here so the game can start without asyncio
+BUZZER_PORT = 8766
+LATENCY_SAMPLES = 1000
+TIMEOUT = 5
+
+
+class RemoteEngine(GameEngine):
+    """
+    Engine that forwards every rule decision to a room on a quiz server and mirrors
+    the state it sends back, so the tkinter front end can use it like a local engine.
+    """
+    def __init__(self, questions, quiz, address, room):
+        super().__init__(questions)
+        self.connection = socket.create_connection(address, timeout=TIMEOUT)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.stream = self.connection.makefile("rwb")
+        self.request({"cmd": "join", "room": room, "quiz": os.path.abspath(quiz)})
+
+    def request(self, message):
+        """
+        Send a command to the server, apply the returned state and return the result.
+        """
+        self.stream.write(json.dumps(message).encode("utf-8") + b"\n")
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("quiz server closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        self.restore(response["state"])
+        if self.question and response["state"]["answers"]:
+            # the server shuffled the answers of its own copy of the question
+            self.question.answers = response["state"]["answers"]
+        return response["result"]
+
+    def pick(self, num, points, i):
+        if self.request({"cmd": "pick", "num": num, "points": points, "i": i}):
+            return self.question
+        return None
+
+    def buzz(self, team):
+        return self.request({"cmd": "buzz", "team": team})
+
+    def select_answer(self, a_nr):
+        return self.request({"cmd": "answer", "nr": a_nr})
+
+    def finish_question(self):
+        return self.request({"cmd": "finish"})
+
+    def next_round(self):
+        return self.request({"cmd": "round"})
+
+    def reset(self):
+        self.request({"cmd": "reset"})
+
+    def close(self):
+        """
+        Disconnect from the server.
+        """
+        self.stream.close()
+        self.connection.close()
+
+
+def server_stats(address):
+    """
+    Return the room statistics of a quiz server.
+    """
+    with socket.create_connection(address, timeout=TIMEOUT) as connection:
+        stream = connection.makefile("rwb")
+        stream.write(b'{"cmd": "stats"}\n')
+        stream.flush()
+        return json.loads(stream.readline())["result"]
+
+
+def parse_address(text):
+    """
+    Parse an address like localhost:8765.
+    """
+    host, _, port = text.rpartition(":")
+    return host or HOST, int(port)
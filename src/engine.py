@@ -0,0 +1,195 @@
+"""
+Widget-free game rules that are driven by the tkinter front end or a simulation.
+"""
+
+LOGGED = "logged"
+CORRECT = "correct"
+WRONG = "wrong"
+
+
+class GameEngine:
+    """
+    Holds the state of a game for two teams and applies the rules.
+    The questions are only read, so several games can share them.
+    They are given as one board or as a list with the board of every round.
+    """
+    def __init__(self, questions):
+        self.rounds = questions if isinstance(questions, list) else [questions]
+        self.start()
+
+    def start(self):
+        """
+        Set the state for a new game.
+        """
+        self.players = {"blue": 0, "red": 0}
+        self.team_blues_turn = True
+        self.set_round(0)
+
+    def set_round(self, index):
+        """
+        Start the board of a round, the points and the turn are kept.
+        """
+        self.round = index
+        self.questions = self.rounds[index]
+        self.current_question = None
+        self.current = None
+        self.question = None
+        self.active_team = self.turn_team()
+        self.answer_logged_in = -1
+        self.buzzed = False
+        self.wrong_answers = []
+        self.owners = {}
+        self.played = set()
+        self.remaining = sum(len(self.questions[points]) for points in self.questions)
+
+    def reset(self):
+        """
+        Start a new game with the same questions.
+        """
+        self.start()
+
+    def snapshot(self):
+        """
+        Return the state of the game as a json serializable dict.
+        """
+        return {"players": dict(self.players), "team_blues_turn": self.team_blues_turn,
+                "current_question": self.current_question, "current": self.current,
+                "active_team": self.active_team, "answer_logged_in": self.answer_logged_in,
+                "buzzed": self.buzzed, "wrong_answers": list(self.wrong_answers),
+                "owners": dict(self.owners), "played": sorted(self.played),
+                "remaining": self.remaining, "round": self.round}
+
+    def restore(self, state):
+        """
+        Continue a game from a snapshot.
+        """
+        self.round = state["round"]
+        self.questions = self.rounds[self.round]
+        self.players = dict(state["players"])
+        self.team_blues_turn = state["team_blues_turn"]
+        self.current_question = state["current_question"]
+        self.current = tuple(state["current"]) if state["current"] else None
+        self.question = self.questions[self.current[0]][self.current[1]] if self.current else None
+        self.active_team = state["active_team"]
+        self.answer_logged_in = state["answer_logged_in"]
+        self.buzzed = state.get("buzzed", False)
+        self.wrong_answers = list(state["wrong_answers"])
+        self.owners = dict(state["owners"])
+        self.played = {tuple(key) for key in state["played"]}
+        self.remaining = state["remaining"]
+
+    def turn_team(self):
+        """
+        Return the team whose turn it is to pick a question.
+        """
+        return "blue" if self.team_blues_turn else "red"
+
+    def pick(self, num, points, i):
+        """
+        Pick a question, returns None if it was already played.
+        """
+        if (points, i) in self.played:
+            return None
+        self.current_question = num
+        self.current = (points, i)
+        self.question = self.questions[points][i]
+        self.active_team = self.turn_team()
+        self.answer_logged_in = -1
+        self.buzzed = False
+        self.wrong_answers = []
+        return self.question
+
+    def buzz(self, team):
+        """
+        Let the team that buzzed first answer the open question.
+        Returns False if the question was already taken or answered.
+        """
+        if (not self.question or self.current in self.played or self.buzzed
+                or self.wrong_answers or self.answer_logged_in != -1):
+            return False
+        self.buzzed = True
+        self.active_team = team
+        return True
+
+    def select_answer(self, a_nr):
+        """
+        Log in an answer on the first selection and check it on the second one.
+        Returns LOGGED, CORRECT, WRONG or None if the selection is ignored.
+        """
+        if not self.question or self.current in self.played or a_nr in self.wrong_answers:
+            return None
+        if self.answer_logged_in != a_nr:
+            self.answer_logged_in = a_nr
+            return LOGGED
+
+        self.answer_logged_in = -1
+        if self.question.check_answer(a_nr):
+            self.played.add(self.current)
+            return CORRECT
+
+        self.wrong_answers.append(a_nr)
+        self.active_team = "red" if self.active_team == "blue" else "blue"
+        return WRONG
+
+    def finish_question(self):
+        """
+        Give the points of the answered question to the active team and pass the turn.
+        Returns the team that got the points.
+        """
+        team = self.active_team
+        self.players[team] += self.question.points
+        self.owners[self.current_question] = team
+        self.team_blues_turn = not self.team_blues_turn
+        self.remaining -= 1
+        self.current = None
+        self.question = None
+        self.wrong_answers = []
+        return team
+
+    def next_round(self):
+        """
+        Continue with the board of the next round once the current one is over.
+        Returns whether there was another round.
+        """
+        if self.remaining or self.round + 1 >= len(self.rounds):
+            return False
+        self.set_round(self.round + 1)
+        return True
+
+    def round_over(self):
+        """
+        Return whether all questions of the current round have been answered.
+        """
+        return self.remaining == 0
+
+    def finished(self):
+        """
+        Return whether all questions of all rounds have been answered.
+        """
+        return self.remaining == 0 and self.round == len(self.rounds) - 1
+
+    def winner(self):
+        """
+        Return the winning team or None for a draw.
+        """
+        if self.players["red"] > self.players["blue"]:
+            return "red"
+        if self.players["red"] < self.players["blue"]:
+            return "blue"
+        return None
+
+
+def tiles(questions):
+    """
+    Yield the name, points and index of every question on the board.
+    """
+    for j, points in enumerate(questions):
+        for i in range(len(questions[points])):
+            yield tile_name(j, i), points, i
+
+
+def tile_name(row, column):
+    """
+    Return the name of a question like A1 or B2.
+    """
+    return f"{chr(ord('a') + row).upper()}{column+1}"
@@ -3,21 +3,35 @@ Logic for game.
 """
 import os
 import sys
-import csv
 import tkinter as tk
-from functools import partial
 
-from PIL import Image, ImageTk
-
-from src.player import Player
+from PIL import ImageTk
+
+from src.assetcache import ASSET_CACHE, scaled_size
+from src.catalog import QuizCatalog, quiz_title
+from src.client import RemoteEngine
+from src.engine import GameEngine
+from src.journal import Journal, journal_path, quiz_header, resume
+from src.layout import Layout
+from src.mediacache import MEDIA_CACHE
+from src.player import VLC, Player, SilentPlayer
+from src.probe import PROBE
 from src.scores import PointHandler
 from src.questionboard import QuestionBoard
-from src.question import Question
+from src.quizfile import load_questions, load_rounds
+from src.recorder import RECORDER
 from src.questionscreen import QuestionScreen
+from src.renditions import Renditions
+from src.reveal import RevealSurface
+from src.startup import STARTUP
+from src.tracing import TRACER, LagMonitor, traced
+from src.quizselection import QuizSelection
 
 __version__ = "1.0.0"
 
 FONT = "comfortaa"
+SELECTION_BACKGROUND = "gameplay/hintergrund.jpg"
+GAME_BACKGROUND = "gameplay/hintergrund2.png"
 
 RESOLUTIONS = [(640, 360), (960, 540), (1280, 720), (1600, 900), (1920, 1080),
                (2048, 1152), (2560, 1440), (3200, 1800), (3840, 2160), (4096, 2304),
@@ -26,235 +40,509 @@ RESOLUTIONS = [(640, 360), (960, 540), (1280, 720), (1600, 900), (1920, 1080),
 class Framework:
     """
     Class that handles game layout.
+
+    One Tk root hosts the quiz selection and the game as views. Backgrounds and
+    fonts are loaded once per scale and the game widgets are reused for every quiz.
     """
-    def __init__(self):
-        self.quiz = None
-        self.scale = 1
-        self.offset = (0, 0)
-        geo = self.select_quiz()
+    def __init__(self, quiz_dirs=None, quiz=None, resolution=None, mainloop=True, server=None,
+                 resume=True, replay=False, buzzer=None):
+        self.quiz = quiz
+        self.server = server
+        self.resume = resume
+        self.replay = replay
+        self.catalog = QuizCatalog(quiz_dirs or ["."])
+        STARTUP.step("imports and arguments")
         self.window = tk.Tk()
         self.window.attributes('-fullscreen', True)
-        self.window.bind("<Escape>", self.full_screeen)
+        self.full_screeen_on = True
+        self.window.bind("<Escape>", self.escape)
         self.window.bind("<F11>", self.full_screeen)
-        self.player = Player(self.window)
+        width, height = resolution or (self.window.winfo_screenwidth(),
+                                       self.window.winfo_screenheight())
+        self.set_resolution(width, height)
+        self.window.geometry(f"{int(1920*self.scale)}x{int(1080*self.scale)}")
+        self.layout = Layout(self.window, self.scale, self.offset, self.fit_window, FONT)
+        self.layout.on_rescale(self.rescale)
+        # a replay does not play media and does not touch the journal
+        self.player = SilentPlayer(self.window) if replay else Player(self.window)
+        self.backgrounds = {}
+        self.background_path = None
+        self.background_label = tk.Label(self.window, bg="black")
+        self.background_label.place(x=0, y=0, relwidth=1, relheight=1)
+        self.icon = tk.PhotoImage(file="gameplay/icon.png")
+        self.window.iconphoto(False, self.icon)
+        self.view = None
+        self.selection = None
+        self.game = None
+        self.question_board = None
+        self.buzzer = None
+        if buzzer:
+            # teams buzz in over the network, asyncio is only imported then
+            from src.buzzer import BuzzerInput # pylint: disable=import-outside-toplevel
+            self.buzzer = BuzzerInput(self.window, self.buzzed, port=buzzer)
+        if TRACER.enabled:
+            LagMonitor(self.window).start()
+        STARTUP.step("main window")
+
+        if quiz:
+            self.start_game(quiz)
+        else:
+            self.show_selection()
+        self.first_screen()
+        if mainloop:
+            self.window.mainloop()
 
+    def first_screen(self):
+        """
+        Draw the first screen, then load vlc in the background while it is shown.
+        With a startup profile the report is printed and the program ends.
+        """
+        self.window.update()
+        STARTUP.step("first screen drawn")
+        if self.replay:
+            return
+        thread = VLC.preload(self.player.setup)
+        if STARTUP.enabled:
+            thread.join()
+            STARTUP.report({"vlc": VLC.seconds})
+            self.window.destroy()
+            sys.exit(0)
+
+    def show_selection(self):
+        """
+        Switch to the quiz selection, leaving a running game.
+        """
+        if self.view == "game":
+            RECORDER.record("selection")
+            self.hide_game()
+        if not self.selection:
+            self.selection = QuizSelection(self, self.catalog, self.start_game, __version__)
+            STARTUP.step("selection screen")
+        self.window.title("Quiz Wall")
+        self.set_background(SELECTION_BACKGROUND)
+        self.selection.show()
+        self.view = "selection"
+
+    def start_game(self, quiz):
+        """
+        Switch to the game with a quiz.
+        """
+        RECORDER.record("quiz", quiz=os.path.abspath(quiz))
+        if self.view == "selection":
+            self.selection.hide()
+        self.quiz = quiz
+        self.window.title(quiz_title(quiz))
+        self.set_background(GAME_BACKGROUND)
         self.game = Game(self)
-        self.full_screeen_on = True
-        self.setup_game(geo)
-
-    def select_quiz(self):
-        """
-        Select the quiz and get screen resolution.
-        """
-        root = tk.Tk()
-        root.attributes('-fullscreen', True)
-        root.bind("<Escape>", partial(self.quit, root))
-        root.update_idletasks()
-        width, height = [int(f) for f in root.winfo_geometry().split("+")[0].split("x")]
-
-        res = tk.Entry(root)
-        res.insert(0, f"{width}x{height}")
-        self.change_res(res, False)
-
-        quizzes = [
-            f for f in os.listdir(".") if os.path.isfile(os.path.join(".", f)) \
-            and f.split(".")[-1] == "csv"]
-
-        img = Image.open("gameplay/hintergrund.jpg")
-        img = ImageTk.PhotoImage(img.resize((int(1920*self.scale), int(1080*self.scale)),
-                                            Image.ANTIALIAS))
-        background_label = tk.Label(root, image=img, bg="black")
-        background_label.place(x=0, y=0, relwidth=1, relheight=1)
-        root.iconphoto(False, tk.PhotoImage(file="gameplay/icon.png"))
-
-        res = tk.Entry(root)
-        res.insert(0, f"{width}x{height}")
-        x_pos = int(1800*self.scale)
-        y_pos = int(1000*self.scale)
-        res.place(x=x_pos, y=y_pos, width=int(100*self.scale), height=int(50*self.scale))
-        action = partial(self.change_res, res)
-        button = tk.Button(root, text="Change resolution", command=action)
-        x_pos = int(1580*self.scale)
-        y_pos = int(1000*self.scale)
-        button.place(x=x_pos, y=y_pos, width=int(200*self.scale), height=int(50*self.scale))
-
-        x_pos = int((width-1920*self.scale)/2 + 710*self.scale)
-        y_pos = int((height-1080*self.scale)/2 +100*self.scale)
-        title = tk.Text(root, highlightthickness=0, borderwidth=0)
-        title.place(x=x_pos, y=y_pos, width=int(500*self.scale), height=int(80*self.scale))
-        title.tag_configure("center", justify='center')
-        title.insert(tk.END, "Select Quiz:")
-        title.tag_add("center", "1.0", "end")
-        title.config(font=self.get_font(), wrap=tk.WORD, fg="black")
-        title.config(state="disabled")
-
-        x_pos = int(0*self.scale)
-        y_pos = int(1040*self.scale)
-        version = tk.Text(root, highlightthickness=0, borderwidth=0)
-        version.place(x=x_pos, y=y_pos, width=int(100*self.scale), height=int(40*self.scale))
-        version.tag_configure("center", justify='center')
-        version.insert(tk.END, "v" + __version__)
-        version.tag_add("center", "1.0", "end")
-        version.config(font=self.get_font(20), wrap=tk.WORD, fg="black")
-        version.config(state="disabled")
-        for i, quiz in enumerate(quizzes):
-            action = partial(self.quit, root, None, quiz)
-            button = tk.Button(root, text=quiz.split(".")[0], command=action)
-            x_pos = int((width-1920*self.scale)/2 + 710*self.scale)
-            y_pos = int((height-1080*self.scale)/2 + (200+i*100)*self.scale)
-            button.place(x=x_pos, y=y_pos, width=int(500*self.scale), height=int(80*self.scale))
-
-        root.mainloop()
-        return f"{int(1920*self.scale)}x{int(1080*self.scale)}"
-
-    def change_res(self, entry, change_color=True):
+        STARTUP.step("questions")
+        if not self.question_board:
+            self.setup_game()
+        else:
+            self.point_handler.reset()
+            self.question_board.load(self.game.questions)
+        self.question_screen.prepare(self.game.questions)
+        self.show_game()
+        self.view = "game"
+
+    def setup_game(self):
+        """
+        Create the widgets of the game view, they are reused for later quizzes.
+        """
+        self.point_handler = PointHandler(self)
+        self.question_board = QuestionBoard(self, self.game.questions)
+        self.question_screen = QuestionScreen(self)
+        self.reveal = RevealSurface(self)
+
+        self.title = tk.Text(self.window, highlightthickness=0, borderwidth=0)
+        self.layout.add(self.title, 418, 40, 1140, 80)
+        self.title.tag_configure("center", justify='center')
+        self.title.config(font=self.get_font(), wrap=tk.WORD)
+
+        self.back_button = tk.Button(self.window, text="Quizzes", command=self.show_selection,
+                                     font=self.get_font(20))
+        self.layout.add(self.back_button, 20, 980, 150, 60)
+        self.next_button = tk.Button(self.window, text="Next round", command=self.next_round,
+                                     font=self.get_font(20))
+        self.layout.add(self.next_button, 1750, 980, 150, 60)
+        self.warning = tk.Label(self.window, fg="#b52d00", bg="#ffffff", font=self.get_font(15),
+                                anchor="w")
+        self.layout.add(self.warning, 190, 995, 1540, 30)
+        STARTUP.step("game screen")
+
+    def show_game(self):
+        """
+        Show the game view for the current game.
+        """
+        for num, team in self.game.engine.owners.items():
+            self.question_board.color_tile(num, team)
+        self.show_title()
+        for widget in [self.title, self.point_handler.point_canvas,
+                       *self.point_handler.score.values()]:
+            self.layout.show(widget)
+        self.question_board.show_buttons()
+        if self.game.engine.question:
+            self.game.continue_question()
+        if self.game.engine.finished():
+            self.game.show_winner()
+        elif self.game.engine.round_over():
+            self.layout.show(self.next_button)
+
+    def show_title(self):
+        """
+        Show the title of the quiz and the name of the round in the color of the team to pick.
+        """
+        title = quiz_title(self.quiz)
+        if self.game.round_name():
+            title = f"{title} - {self.game.round_name()}"
+        self.title.config(state="normal")
+        self.title.delete("1.0", tk.END)
+        self.title.insert(tk.END, title)
+        self.title.tag_add("center", "1.0", "end")
+        self.title.config(fg=self.game.engine.turn_team(), state="disabled")
+
+    def next_round(self):
+        """
+        Replace the board with the one of the next round.
+        """
+        RECORDER.record("round")
+        self.layout.hide(self.next_button)
+        if self.game.next_round():
+            self.question_board.load(self.game.questions)
+            self.question_screen.prepare(self.game.questions)
+            self.show_title()
+
+    def hide_game(self):
+        """
+        Hide the game view and end the current game.
+        """
+        self.player.stop()
+        self.disarm_buzzers()
+        if self.buzzer and self.buzzer.report():
+            print(self.buzzer.report())
+        self.reveal.hide()
+        self.question_screen.disable_elements()
+        self.question_board.hide_buttons()
+        self.question_board.remove_winner_buttons()
+        for widget in [self.title, self.back_button, self.next_button, self.warning,
+                       self.point_handler.point_canvas,
+                       *self.point_handler.score.values()]:
+            self.layout.hide(widget)
+        self.game.close()
+
+    def arm_buzzers(self):
+        """
+        Let the teams buzz in for the question that was just shown.
+        """
+        if self.buzzer:
+            self.buzzer.arm()
+
+    def disarm_buzzers(self):
+        """
+        Ignore the buzzers until the next question.
+        """
+        if self.buzzer:
+            self.buzzer.disarm()
+
+    def buzzed(self, team, answer, pressed):
+        """
+        Give the question to the team that buzzed first and log in the answer
+        sent with the press, then record how long it took to show.
+        """
+        if self.view != "game" or not self.game.buzz(team):
+            return
+        if answer is not None:
+            self.question_screen.login_answer(answer)
+        self.window.update_idletasks()
+        self.buzzer.shown(pressed)
+
+    def show_warnings(self, warnings):
+        """
+        Print the warnings of loading a quiz and show them below the board.
+        """
+        for warning in warnings:
+            print(warning)
+        if not warnings:
+            self.layout.hide(self.warning)
+            return
+        more = f" (and {len(warnings) - 1} more)" if len(warnings) > 1 else ""
+        self.warning.config(text=warnings[0] + more)
+        self.layout.show(self.warning)
+
+    def escape(self, event):
+        """
+        Leave the program from the quiz selection, toggle full screen mode in the game.
+        """
+        if self.view == "selection":
+            self.quit()
+        else:
+            self.full_screeen(event)
+
+    def change_res(self, entry):
         """
         Change the resolution from user input.
         """
         text = entry.get()
         if "x" in text:
             width, height = [int(f) for f in text.split("x")]
-            self.scale = get_resolution(width, height)
-            self.offset = (int((width-1920*self.scale)/2), int((height-1080*self.scale)/2))
-            if change_color:
-                entry.config({"background": "#44ff00"})
+            self.set_resolution(width, height)
+            self.window.geometry(f"{int(1920*self.scale)}x{int(1080*self.scale)}")
+            self.layout.set_scale(self.scale, self.offset)
+            entry.config({"background": "#44ff00"})
         else:
             entry.config({"background": "#ff0000"})
 
-    def quit(self, root=None, event=None, quiz=None):
+    def set_resolution(self, width, height):
         """
-        Destroy window.
+        Set scale and offset for a screen size.
         """
-        if event:
-            sys.exit("No quiz choosen.")
-        if quiz:
-            self.quiz = quiz
+        self.scale = get_resolution(width, height)
+        self.offset = (int((width-1920*self.scale)/2), int((height-1080*self.scale)/2))
 
-        root.destroy()
+    def fit_window(self, width, height):
+        """
+        Return scale and offset for a window size, or None if the window is too small.
+        """
+        if width < RESOLUTIONS[0][0] or height < RESOLUTIONS[0][1]:
+            return None, None
+        scale = get_resolution(width, height)
+        return scale, (int((width-1920*scale)/2), int((height-1080*scale)/2))
+
+    def rescale(self):
+        """
+        Follow a new scale of the layout and scale the background.
+        """
+        self.scale = self.layout.scale
+        self.offset = self.layout.offset
+        self.backgrounds = {key: images for key, images in self.backgrounds.items()
+                            if key[1] == self.scale}
+        self.set_background(self.background_path)
+
+    def quit(self):
+        """
+        Destroy window.
+        """
+        self.window.destroy()
+        sys.exit("No quiz choosen.")
 
     def get_font(self, size=40):
         """
         Get the scaled font.
         """
-        return (FONT, int(size*self.scale))
+        return self.layout.font(size)
 
-    def full_screeen(self, _):
+    def get_background(self, path):
         """
-        Toggle full screen mode.
+        Get a background image scaled to the screen as PIL image and PhotoImage.
+        Every background is only loaded once per scale.
         """
-        self.full_screeen_on = not self.full_screeen_on
-        self.window.attributes("-fullscreen", self.full_screeen_on)
+        key = (path, self.scale)
+        if key not in self.backgrounds:
+            image = ASSET_CACHE.get(path, scaled_size(self.scale))
+            self.backgrounds[key] = (image, ImageTk.PhotoImage(image))
+        return self.backgrounds[key]
 
-    def setup_game(self, geo):
+    def set_background(self, path):
         """
-        Initialize the game and setup some basic tkinter stuff.
+        Show a background behind the current view.
         """
-        self.window.title(self.quiz.split(".")[0])
-        self.window.geometry(geo)
-        img = Image.open("gameplay/hintergrund2.png")
-        img = ImageTk.PhotoImage(img.resize((int(1920*self.scale), int(1080*self.scale)),
-                                            Image.ANTIALIAS))
-        background_label = tk.Label(self.window, image=img, bg="black")
-        background_label.place(x=0, y=0, relwidth=1, relheight=1)
-        photo = tk.PhotoImage(file="gameplay/icon.png")
-        self.window.iconphoto(False, photo)
+        self.background_path = path
+        self.background_label.config(image=self.get_background(path)[1])
 
-        self.point_handler = PointHandler(self)
-        self.question_board = QuestionBoard(self, self.game.questions)
-        self.question_screen = QuestionScreen(self)
-
-        self.title = tk.Text(self.window, highlightthickness=0, borderwidth=0)
-        self.title.place(x=self.offset[0]+int(418*self.scale), y=self.offset[1]+int(40*self.scale),
-                         width=int(1140*self.scale), height=int(80*self.scale))
-        self.title.tag_configure("center", justify='center')
-        self.title.insert(tk.END, self.quiz.split(".")[0])
-        self.title.tag_add("center", "1.0", "end")
-        self.title.config(font=self.get_font(), wrap=tk.WORD, fg="blue")
-        self.title.config(state="disabled")
+    def background_crop(self, box):
+        """
+        Get a part of the game background, box is given in screen pixels relative to offset.
+        """
+        return ImageTk.PhotoImage(self.get_background(GAME_BACKGROUND)[0].crop(box))
 
-        self.window.mainloop()
+    def full_screeen(self, _):
+        """
+        Toggle full screen mode.
+        """
+        RECORDER.record("fullscreen")
+        self.full_screeen_on = not self.full_screeen_on
+        self.window.attributes("-fullscreen", self.full_screeen_on)
 
 
 class Game:
     """
-    Class that contains game logic.
+    Class that connects the game rules with the widgets.
     """
     def __init__(self, framework):
-        self.players = {"blue": 0,
-                        "red": 0}
-        self.team_blues_turn = True
-        self.current_question = None
         self.framework = framework
-        self.questions = create_questions(self.framework.quiz)
+        self.rounds = load_rounds(self.framework.quiz)
+        boards = [questions for _, questions in self.rounds]
+        self.renditions = Renditions(framework.quiz)
+        self.journal = None
+        if framework.server:
+            # the rules are applied by a quiz server, framework.server is (address, room)
+            self.engine = RemoteEngine(boards, framework.quiz, *framework.server)
+        else:
+            self.engine = GameEngine(boards)
+            if not framework.replay:
+                path = journal_path(framework.quiz)
+                resumed = framework.resume and resume(self.engine, framework.quiz, path)
+                self.journal = Journal(path, None if resumed else quiz_header(framework.quiz))
+        # only the board of the current round is used until the next round starts
+        self.questions = self.engine.questions
+        self.probe()
+
+    @property
+    def players(self):
+        """
+        Points of both teams.
+        """
+        return self.engine.players
 
+    @property
+    def current_question(self):
+        """
+        Name of the question that was picked last.
+        """
+        return self.engine.current_question
+
+    def round_name(self):
+        """
+        Return the name of the current round, or None if the quiz has no rounds.
+        """
+        if len(self.rounds) == 1:
+            return None
+        return self.rounds[self.engine.round][0] or f"Round {self.engine.round + 1}"
+
+    def next_round(self):
+        """
+        Continue with the next round and release the media of the last one.
+        Returns whether there was another round.
+        """
+        if not self.engine.next_round():
+            return False
+        if self.journal:
+            self.journal.record("round")
+        self.questions = self.engine.questions
+        MEDIA_CACHE.clear()
+        self.probe()
+        return True
+
+    def probe(self):
+        """
+        Probe the solution files of the current board in the background.
+        A replay plays no media, so it does not need to know their lengths.
+        """
+        if not self.framework.replay:
+            PROBE.probe_questions(self.questions, self.framework.window, self.probed)
+
+    def probed(self, warnings):
+        """
+        Show the warnings of the media probe while the game is still played.
+        """
+        if self.framework.game is self and self.framework.view == "game":
+            self.framework.show_warnings(warnings)
+
+    @traced
     def ask_question(self, num, points, i):
         """
         Setup a question to ask.
         """
-        self.current_question = num
-        question = self.questions[points][i]
-        if question.played:
+        RECORDER.record("pick", num=num, points=points, i=i)
+        question = self.engine.pick(num, points, i)
+        if not question:
             return
+        if self.journal:
+            self.journal.pick(num, points, i)
 
         self.framework.question_board.hide_buttons()
-        if self.team_blues_turn:
-            active_team = "blue"
-        else:
-            active_team = "red"
-        self.framework.question_screen.set_elements(question, active_team)
+        self.framework.question_screen.set_elements(question, self.engine.active_team)
         self.framework.question_screen.enable_elements()
+        self.framework.arm_buzzers()
 
-    def question_answered(self, player, answ_question):
+    def continue_question(self):
+        """
+        Show the question that was open when a resumed game was interrupted.
+        """
+        if self.engine.current in self.engine.played:
+            # answered correctly, but the points were not given yet
+            self.question_answered()
+            return
+        screen = self.framework.question_screen
+        self.framework.question_board.hide_buttons()
+        screen.set_elements(self.engine.question, self.engine.active_team)
+        for a_nr in self.engine.wrong_answers:
+            screen.elements[a_nr].configure(bg="#b52d00", activebackground="#b52d00")
+        if self.engine.answer_logged_in != -1:
+            # the next click on it confirms the answer, as before the interruption
+            screen.elements[self.engine.answer_logged_in].configure(bg="#f5c242",
+                                                                    activebackground="#f5c242")
+        screen.enable_elements()
+        self.framework.arm_buzzers()
+
+    @traced
+    def buzz(self, team):
+        """
+        Let a team that buzzed in answer the current question.
+        Returns False if the question was already taken.
+        """
+        RECORDER.record("buzz", team=team)
+        if not self.engine.buzz(team):
+            return False
+        if self.journal:
+            self.journal.record("buzz", team=team)
+        self.framework.question_screen.elements["question"].configure(fg=team)
+        self.framework.title.config(fg=team)
+        return True
+
+    def select_answer(self, a_nr):
+        """
+        Select an answer of the current question and return the result.
+        """
+        answer = self.engine.question.answers[a_nr]
+        result = self.engine.select_answer(a_nr)
+        if self.journal and result:
+            self.journal.answer(answer, result)
+        return result
+
+    @traced
+    def question_answered(self):
         """
         Logic to handle what happens when a question was answerded.
         """
-        self.team_blues_turn = not self.team_blues_turn
+        self.framework.disarm_buzzers()
+        points = self.engine.question.points
+        player = self.engine.finish_question()
+        if self.journal:
+            self.journal.finish(player, points, self.engine)
+        self.framework.title.config(fg=self.engine.turn_team())
 
-        if self.team_blues_turn:
-            self.framework.title.config(fg="blue")
-
-        else:
-            self.framework.title.config(fg="red")
-
-        self.players[player] += answ_question.points
         self.framework.point_handler.set_points()
         self.framework.question_board.set_button_color(player)
         self.framework.question_screen.disable_elements()
         self.framework.question_board.show_buttons()
-        finished = True
-        for points in self.questions:
-            for question in self.questions[points]:
-                if not question.played:
-                    finished = False
-            if not finished:
-                break
 
-        if finished:
+        if self.engine.finished():
             self.show_winner()
+        elif self.engine.round_over():
+            self.framework.layout.show(self.framework.next_button)
 
     def show_winner(self):
         """
-        Show who won the game.
+        Show who won the game and the button back to the quiz selection.
         """
         self.framework.question_board.add_winner_button()
+        self.framework.layout.show(self.framework.back_button)
+
+    def close(self):
+        """
+        End the game, disconnecting from the quiz server if it is played on one.
+        """
+        if isinstance(self.engine, RemoteEngine):
+            self.engine.close()
+        if self.journal:
+            self.journal.close()
 
 
 def create_questions(config):
     """
-    Create the questions from csv file.
+    Create the questions from the compiled quiz or from the csv file if it is stale.
     """
-    questions = {}
-
-    with open(config, encoding='utf-8') as csv_file:
-        reader = csv.reader(csv_file)
-        next(reader)
-        for row in reader:
-            question = Question(row)
-            if question.points not in questions.keys():
-                questions[question.points] = []
-            questions[question.points].append(question)
-
-    return questions
+    return load_questions(config)
 
 def get_resolution(screen_w, screen_h):
     """
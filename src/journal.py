@@ -0,0 +1,169 @@
+"""
+Append-only journal of game events to resume a game after the program ended.
+
+Every pick, answer selection and finished question is appended as one json line
+by a background thread that writes queued events in batches. Every few finished
+questions a snapshot of the engine is appended, so resuming only replays the
+events after the last snapshot.
+"""
+
+import os
+import json
+import queue
+import hashlib
+import threading
+
+from src.assetcache import CACHE_DIR
+from src.catalog import quiz_title
+
+SNAPSHOT_EVERY = 10
+
+
+def journal_path(quiz, directory=os.path.join(CACHE_DIR, "journal")):
+    """
+    Return the path of the journal for a quiz.
+    """
+    digest = hashlib.sha1(os.path.abspath(quiz).encode("utf-8")).hexdigest()[:10]
+    return os.path.join(directory, f"{quiz_title(quiz)}-{digest}.jsonl")
+
+
+def quiz_header(quiz):
+    """
+    Return the first event of a journal, identifying the version of the quiz it is for.
+    """
+    stat = os.stat(quiz)
+    return {"t": "start", "quiz": os.path.abspath(quiz), "stat": [stat.st_size, stat.st_mtime_ns]}
+
+
+class Journal:
+    """
+    Writes the events of one game in a background thread.
+    A new journal is started with a header, without one events are appended.
+    """
+    def __init__(self, path, header=None, snapshot_every=SNAPSHOT_EVERY):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.finished = 0
+        self.events = queue.Queue()
+        self.mode = "a" if header is None else "w"
+        if header:
+            self.events.put(header)
+        self.thread = threading.Thread(target=self.write, daemon=True)
+        self.thread.start()
+
+    def record(self, kind, **event):
+        """
+        Queue an event for writing.
+        """
+        self.events.put({"t": kind, **event})
+
+    def pick(self, num, points, i):
+        """
+        Record a picked question.
+        """
+        self.record("pick", num=num, points=points, i=i)
+
+    def answer(self, answer, result):
+        """
+        Record a selected answer by its text, the order of the answers changes on every load.
+        """
+        self.record("answer", answer=answer, result=result)
+
+    def finish(self, team, points, engine):
+        """
+        Record the points given for a question and take a snapshot from time to time.
+        """
+        self.record("finish", team=team, points=points)
+        self.finished += 1
+        if self.finished % self.snapshot_every == 0:
+            self.record("snapshot", state=engine.snapshot())
+
+    def write(self):
+        """
+        Write queued events until the journal is closed. Events that arrive while
+        a batch is written are written together with the next one.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, self.mode, encoding="utf-8") as journal:
+            while True:
+                batch = [self.events.get()]
+                while True:
+                    try:
+                        batch.append(self.events.get_nowait())
+                    except queue.Empty:
+                        break
+                journal.write("".join(json.dumps(event) + "\n" for event in batch if event))
+                journal.flush()
+                os.fsync(journal.fileno())
+                if None in batch:
+                    return
+
+    def close(self):
+        """
+        Write all queued events and stop the writer thread.
+        """
+        self.events.put(None)
+        self.thread.join()
+
+
+def read_journal(path):
+    """
+    Return the header, the last snapshot and the events after it.
+    A last line that was not written completely is ignored.
+    """
+    with open(path, encoding="utf-8") as journal:
+        lines = journal.readlines()
+    if lines and not lines[-1].endswith("\n"):
+        lines.pop()
+    if not lines:
+        return None, None, []
+    header = json.loads(lines[0])
+    start = 1
+    for index in range(len(lines) - 1, 0, -1):
+        if lines[index].startswith('{"t": "snapshot"'):
+            start = index
+            break
+
+    snapshot = None
+    events = []
+    for line in lines[start:]:
+        event = json.loads(line)
+        if event["t"] == "snapshot":
+            snapshot = event["state"]
+        else:
+            events.append(event)
+    return header, snapshot, events
+
+
+def resume(engine, quiz, path):
+    """
+    Restore the game of a quiz from its journal.
+    Returns False if there is no journal for this version of the quiz or its game is over.
+    """
+    try:
+        header, snapshot, events = read_journal(path)
+        if header != quiz_header(quiz):
+            return False
+        if snapshot:
+            engine.restore(snapshot)
+        for event in events:
+            if event["t"] == "pick":
+                engine.pick(event["num"], event["points"], event["i"])
+            elif event["t"] == "buzz":
+                engine.buzz(event["team"])
+            elif event["t"] == "answer":
+                engine.select_answer(engine.question.answers.index(event["answer"]))
+            elif event["t"] == "finish":
+                engine.finish_question()
+            elif event["t"] == "round":
+                engine.next_round()
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError, KeyError, IndexError, AttributeError) as error:
+        print(f"Could not resume from journal {path}: {error}")
+        engine.reset()
+        return False
+    if engine.finished():
+        engine.reset()
+        return False
+    return True
@@ -0,0 +1,156 @@
+"""
+Layout engine that places widgets given in the 1920x1080 design space.
+"""
+
+import tkinter.font as tkfont
+
+RESIZE_DELAY = 150
+
+
+class Layout:
+    """
+    Places registered widgets for the current scale and re-places them when the window
+    is resized. Geometry is computed once per scale and kept in a table.
+    """
+    def __init__(self, window, scale, offset, fit, family):
+        self.window = window
+        self.scale = scale
+        self.offset = offset
+        self.fit = fit
+        self.family = family
+        self.boxes = {}
+        self.tables = {}
+        self.visible = set()
+        self.placed = {}
+        self.fonts = {}
+        self.listeners = []
+        self.size = None
+        self.pending = None
+        self.window.bind("<Configure>", self.configure, add="+")
+
+    def add(self, widget, x_pos, y_pos, width=None, height=None):
+        """
+        Register a widget with its box in design coordinates without showing it.
+        A widget that is shown already is moved to the new box.
+        """
+        self.boxes[widget] = (x_pos, y_pos, width, height)
+        for table in self.tables.values():
+            table.pop(widget, None)
+        if widget in self.placed:
+            self.apply(widget)
+
+    def place(self, widget, x_pos, y_pos, width=None, height=None):
+        """
+        Register a widget and show it.
+        """
+        self.add(widget, x_pos, y_pos, width, height)
+        self.show(widget)
+
+    def show(self, widget):
+        """
+        Place a registered widget for the current scale.
+        """
+        self.visible.add(widget)
+        self.apply(widget)
+
+    def hide(self, widget):
+        """
+        Hide a widget. It is placed again for the then current scale when shown.
+        """
+        self.visible.discard(widget)
+        self.placed.pop(widget, None)
+        widget.place_forget()
+
+    def remove(self, widget):
+        """
+        Forget a widget, for example before it is destroyed.
+        """
+        self.visible.discard(widget)
+        self.placed.pop(widget, None)
+        self.boxes.pop(widget, None)
+        for table in self.tables.values():
+            table.pop(widget, None)
+
+    def geometry(self, widget):
+        """
+        Return the place arguments of a widget for the current scale and offset.
+        """
+        table = self.tables.setdefault(self.scale, {})
+        if widget not in table:
+            x_pos, y_pos, width, height = self.boxes[widget]
+            table[widget] = (int(x_pos*self.scale), int(y_pos*self.scale),
+                             None if width is None else int(width*self.scale),
+                             None if height is None else int(height*self.scale))
+        x_pos, y_pos, width, height = table[widget]
+        geometry = {"x": self.offset[0] + x_pos, "y": self.offset[1] + y_pos}
+        if width is not None:
+            geometry["width"] = width
+        if height is not None:
+            geometry["height"] = height
+        return geometry
+
+    def apply(self, widget):
+        """
+        Place a widget if its geometry differs from the one it was placed with.
+        """
+        geometry = self.geometry(widget)
+        if self.placed.get(widget) != geometry:
+            widget.place(**geometry)
+            self.placed[widget] = geometry
+
+    def font(self, size):
+        """
+        Return a font for a size in design space that follows the scale.
+        """
+        if size not in self.fonts:
+            self.fonts[size] = tkfont.Font(root=self.window, family=self.family,
+                                           size=int(size*self.scale))
+        return self.fonts[size]
+
+    def on_rescale(self, callback):
+        """
+        Call callback without arguments after the scale or offset changed.
+        """
+        self.listeners.append(callback)
+
+    def configure(self, event):
+        """
+        Collect resize events of the window and handle them once they stop.
+        """
+        if event.widget is not self.window:
+            return
+        size = (event.width, event.height)
+        if self.size is None:
+            # the first event is the window being mapped with the chosen resolution
+            self.size = size
+            return
+        if size == self.size:
+            return
+        self.size = size
+        if self.pending:
+            self.window.after_cancel(self.pending)
+        self.pending = self.window.after(RESIZE_DELAY, self.resize)
+
+    def resize(self):
+        """
+        Update scale and offset to the window size and re-place all visible widgets.
+        fit returns the scale and offset for a window size or None if it is too small.
+        """
+        self.pending = None
+        scale, offset = self.fit(*self.size)
+        if scale is None or (scale, offset) == (self.scale, self.offset):
+            return
+        self.set_scale(scale, offset)
+
+    def set_scale(self, scale, offset):
+        """
+        Switch to a new scale and offset in one layout pass.
+        """
+        self.scale = scale
+        self.offset = offset
+        for size, font in self.fonts.items():
+            font.configure(size=int(size*scale))
+        for callback in self.listeners:
+            callback()
+        for widget in list(self.visible):
+            self.apply(widget)
@@ -0,0 +1,130 @@
+"""
+Shared cache for decoded and scaled solution images.
+"""
+
+import os
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+from src.backdrop import fast_backdrop
+from src.tracing import traced
+
+REVEAL_SIZE = (1280, 720)
+DEFAULT_BUDGET = 256*1024*1024
+
+
+class MediaCache:
+    """
+    LRU cache of ready-to-blit solution images keyed by pack, path, mtime and scale.
+    """
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    @traced
+    def get(self, path, scale, pack=None, renditions=None):
+        """
+        Return the blurred background and the foreground image for a solution file,
+        which is read from pack if given. Prepared renditions are used if they are current.
+        """
+        if pack:
+            key = (pack.path, path, pack.mtime, scale)
+        else:
+            key = (None, path, os.path.getmtime(path), scale)
+        entry = self.entries.get(key)
+        if entry:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0], entry[1]
+
+        self.misses += 1
+        prepared = renditions.get(path, scale, pack) if renditions else None
+        images = None
+        if prepared:
+            try:
+                images = [load_image(image) for image in prepared]
+            except OSError:
+                print(f"Could not load rendition of {path}")
+        background, foreground = images or render_solution(pack.open(path) if pack else path,
+                                                           scale)
+        cost = image_cost(background) + image_cost(foreground)
+        background = ImageTk.PhotoImage(background)
+        foreground = ImageTk.PhotoImage(foreground)
+        self.entries[key] = (background, foreground, cost)
+        self.size += cost
+        self.evict()
+        return background, foreground
+
+    def evict(self):
+        """
+        Drop the least recently used entries until the cache fits its budget.
+        The newest entry is always kept, even if it exceeds the budget alone.
+        """
+        while self.size > self.budget and len(self.entries) > 1:
+            _, (_, _, cost) = self.entries.popitem(last=False)
+            self.size -= cost
+
+    def set_budget(self, budget):
+        """
+        Change the memory budget in bytes.
+        """
+        self.budget = budget
+        self.evict()
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        """
+        Return the hit and miss counters and the memory used.
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries),
+                "size": self.size, "budget": self.budget}
+
+
+@traced
+def render_solution(path, scale):
+    """
+    Load a solution image from a path or file object, fit it into the reveal area
+    and create the blurred background.
+    """
+    width = int(REVEAL_SIZE[0]*scale)
+    height = int(REVEAL_SIZE[1]*scale)
+    img = Image.open(path)
+    img.load()
+
+    im_width, im_height = img.size
+    if im_width > width or im_height > height:
+        fit = min(width/im_width, height/im_height)
+        img = img.resize((max(1, int(im_width*fit)), max(1, int(im_height*fit))),
+                         Image.ANTIALIAS)
+
+    return fast_backdrop(img, (width, height)), img
+
+
+@traced
+def load_image(path):
+    """
+    Load an image file completely.
+    """
+    img = Image.open(path)
+    img.load()
+    return img
+
+
+def image_cost(img):
+    """
+    Estimate the memory used by an image once it is converted for tkinter.
+    """
+    return img.size[0]*img.size[1]*4
+
+
+MEDIA_CACHE = MediaCache()
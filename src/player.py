@@ -1,84 +1,444 @@
 """
 Player module to handle audio and video playback.
+
+python-vlc and libvlc are loaded on first use or in the background by VLC,
+so they do not delay the first screen.
 """
 
 import sys
 import os
+import queue
+import ctypes
+import time
+import itertools
+import threading
+from functools import partial
+
+from src.quizpack import PackFile
+from src.tracing import TRACER, traced
+from src.wakeup import Wakeup
+
+VLC_OPTIONS = "--no-xlib --quiet"
+EFFECTS = ["gameplay/right.mp3", "gameplay/sadTone.mp3", "gameplay/winner.mp3"]
+VOICES = 4
+# how often vlc events are checked for where tkinter can not be woken up by a pipe
+POLL_INTERVAL = 100
+OVERRUN = 3000
+
+# file objects vlc reads media from, by the handles passed to its callbacks
+SOURCES = {}
+STREAMS = {}
+HANDLES = itertools.count(1)
 
-if os.name == 'nt': # Windows
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except AttributeError:
-        base_path = os.path.abspath(".")
 
-    # Python 3.8 things:
-    with os.add_dll_directory(os.path.join(base_path, "local_vlc")):
+def import_vlc():
+    """
+    Import python-vlc, on Windows from the bundled vlc directory.
+    """
+    # pylint: disable=import-outside-toplevel
+    if os.name == 'nt': # Windows
+        try:
+            # PyInstaller creates a temp folder and stores path in _MEIPASS
+            base_path = sys._MEIPASS
+        except AttributeError:
+            base_path = os.path.abspath(".")
+
+        # Python 3.8 things:
+        with os.add_dll_directory(os.path.join(base_path, "local_vlc")):
+            import vlc
+
+    else: # linux
         import vlc
+    return vlc
+
+
+class VlcBackend:
+    """
+    Imports python-vlc and creates the libvlc instance shared by all players once,
+    either on first use or in a background thread.
+    """
+    def __init__(self, options=VLC_OPTIONS):
+        self.options = options
+        self.lock = threading.Lock()
+        self.vlc = None
+        self.instance = None
+        self.callbacks = None
+        self.seconds = None
+
+    def load(self):
+        """
+        Return the python-vlc module, loading it and libvlc if needed.
+        """
+        with self.lock:
+            if self.instance is None:
+                start = time.perf_counter()
+                vlc = import_vlc()
+                self.instance = vlc.Instance(self.options)
+                decorators = vlc.CallbackDecorators
+                # keep the ctypes callbacks alive as long as vlc may call them
+                self.callbacks = (decorators.MediaOpenCb(media_open),
+                                  decorators.MediaReadCb(media_read),
+                                  decorators.MediaSeekCb(media_seek),
+                                  decorators.MediaCloseCb(media_close))
+                self.vlc = vlc
+                self.seconds = time.perf_counter() - start
+        return self.vlc
+
+    def preload(self, then=None):
+        """
+        Load vlc in a background thread and call then without arguments from that thread.
+        """
+        def run():
+            self.load()
+            if then:
+                then()
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def media(self, source):
+        """
+        Create a vlc media for a path or for a file object of a quiz pack.
+        Returns the media and the handle of the file object or None.
+        """
+        self.load()
+        if isinstance(source, str):
+            return self.instance.media_new(source), None
+        handle = next(HANDLES)
+        SOURCES[handle] = source
+        return self.instance.media_new_callbacks(*self.callbacks, handle), handle
+
+
+def media_open(opaque, data, size):
+    """
+    Open a new stream for a media created by VlcBackend.media.
+    """
+    stream = SOURCES[opaque].reopen()
+    handle = next(HANDLES)
+    STREAMS[handle] = stream
+    data[0] = handle
+    size[0] = stream.size
+    return 0
+
+
+def media_read(opaque, buffer, length):
+    """
+    Copy the next bytes of a stream into the buffer of vlc.
+    """
+    target = (ctypes.c_char*length).from_address(ctypes.addressof(buffer.contents))
+    return STREAMS[opaque].readinto(target)
+
+
+def media_seek(opaque, offset):
+    """
+    Move a stream to an absolute offset.
+    """
+    STREAMS[opaque].seek(offset)
+    return 0
+
+
+def media_close(opaque):
+    """
+    Forget a stream vlc is done with.
+    """
+    STREAMS.pop(opaque, None)
 
-else: # linux
-    import vlc
 
 class Player:
     """
     Class that creates and handles vlc player instances.
+
+    Playback completion is reported by the vlc event manager on a vlc thread
+    and queued, the tkinter thread is woken up to handle it by Wakeup. The vlc
+    thread never calls into tkinter, which would block it until the tkinter
+    thread answers while that may wait for vlc. The vlc players are created in
+    the background or when the first file is played.
+
+    Sound effects are kept in memory and played on their own voices, so they
+    start right away and overlap with each other and with the solution audio.
+
+    If the length of a solution is known from the media probe, playback that
+    has not ended well after it is stopped, so a stalled file cannot hang the game.
     """
     def __init__(self, window):
         self.window = window
-        self.audio_player = vlc.MediaPlayer()
-        vlc_options = '--no-xlib --quiet'
-        inst = vlc.Instance(vlc_options)
-        self.video_player = inst.media_player_new()
+        self.lock = threading.Lock()
+        self.audio_player = None
+        self.video_player = None
+        self.voices = []
+        self.effects = {}
+        self.started = {}
         self.playing = False
-        self.delay = 0
+        self.length = {"audio": 0, "video": 0}
+        self.plays = 0
+        self.callbacks = {}
+        self.pending = []
+        self.video_window = None
+        self.sources = {}
+        self.events = queue.Queue()
+        self.wakeup = Wakeup(window, self.handle_events, POLL_INTERVAL, self.busy)
+
+    @traced
+    def setup(self):
+        """
+        Create the vlc players and load the sound effects unless this was done already.
+        Can be called from a background thread.
+        """
+        with self.lock:
+            if self.audio_player:
+                return
+            vlc = VLC.load()
+            self.voices = [VLC.instance.media_player_new() for _ in range(VOICES)]
+            self.load_effects(vlc)
+            self.video_player = VLC.instance.media_player_new()
+            players = [("video", self.video_player)]
+            players += [(f"effect{voice}", player) for voice, player in enumerate(self.voices)]
+            audio_player = VLC.instance.media_player_new()
+            for channel, player in players + [("audio", audio_player)]:
+                manager = player.event_manager()
+                manager.event_attach(vlc.EventType.MediaPlayerEndReached, self.vlc_event,
+                                     channel, "end")
+                manager.event_attach(vlc.EventType.MediaPlayerEncounteredError, self.vlc_event,
+                                     channel, "error")
+                manager.event_attach(vlc.EventType.MediaPlayerLengthChanged, self.vlc_event,
+                                     channel, "length")
+            # set last, it marks the players as ready
+            self.audio_player = audio_player
+
+    def load_effects(self, vlc):
+        """
+        Read the sound effects into memory and let vlc parse them ahead of their first use.
+        """
+        for path in EFFECTS:
+            try:
+                with open(path, "rb") as effect:
+                    data = memoryview(effect.read())
+            except OSError as error:
+                print(f"Could not load sound effect {path}: {error}")
+                continue
+            media, _ = VLC.media(PackFile(data))
+            media.parse_with_options(vlc.MediaParseFlag.local, 0)
+            self.effects[path] = media
+
+    @traced
+    def play_effect(self, path, on_done=None):
+        """
+        Play a sound effect on an idle voice. on_done is called when the effect is over.
+        The effect is skipped while vlc is still loading in the background or all
+        voices are busy, then on_done is called right away.
+        """
+        channels = [f"effect{voice}" for voice in range(len(self.voices))]
+        idle = [channel for channel in channels if channel not in self.started]
+        if not self.audio_player or not idle:
+            if on_done:
+                self.window.after_idle(on_done)
+            return
+        channel = idle[0]
+        player = self.voices[channels.index(channel)]
+        self.callbacks[channel] = on_done
+        self.started[channel] = time.perf_counter()
+        if path in self.effects:
+            player.set_media(self.effects[path])
+        else:
+            player.set_media(VLC.media(path)[0])
+        if player.play() == -1:
+            self.finish(channel)
+        self.wakeup.watch()
 
-    def play_audio(self, audio_file, retry=True):
+    @traced
+    def play_audio(self, audio_file, retry=True, on_done=None, length=None):
         """
         Set the media of the audio player and start playing.
+        on_done is called when playback is over or the file was skipped.
+        length is the expected duration in ms if it is known.
         """
         if self.playing: # player is busy
             if retry:
-                self.window.after(500, self.play_audio, audio_file, False)
+                self.pending.append(partial(self.play_audio, audio_file, False, on_done, length))
+            elif on_done:
+                self.window.after_idle(on_done)
         else: # player is ready
+            self.setup()
             self.playing = True
-            self.audio_player.set_media(vlc.Media(audio_file))
-            self.audio_player.play()
-            self.window.after(750, self.get_delay)
+            self.callbacks["audio"] = on_done
+            self.expect("audio", length)
+            self.set_media("audio", self.audio_player, audio_file)
+            if self.audio_player.play() == -1:
+                self.finish("audio")
+            self.wakeup.watch()
 
-
-    def play_video(self, video_file, canvas, retry=True):
+    @traced
+    def play_video(self, video_file, widget, retry=True, on_done=None, length=None):
         """
-        Set the media of the video player, attach it to canvas and start playing.
+        Set the media of the video player, attach it to widget and start playing.
+        on_done is called when playback is over or the file was skipped.
+        length is the expected duration in ms if it is known.
         """
         if self.playing: # player is busy
             if retry:
-                self.window.after(500, self.play_video, video_file, canvas, False)
+                self.pending.append(partial(self.play_video, video_file, widget, False, on_done,
+                                            length))
+            elif on_done:
+                self.window.after_idle(on_done)
         else: # player is ready
-            xid = canvas.winfo_id()
-            self.video_player.set_media(vlc.Media(video_file))
-            if os.name == 'nt': # Windows
-                self.video_player.set_hwnd(xid)
-            else:
-                self.video_player.set_xwindow(xid)
-            self.window.after(50, self.video_player.play)
-            self.window.after(500, self.get_delay)
+            self.setup()
+            self.playing = True
+            self.callbacks["video"] = on_done
+            self.expect("video", length)
+            xid = widget.winfo_id()
+            self.set_media("video", self.video_player, video_file)
+            if xid != self.video_window: # the reveal surface keeps its window
+                self.video_window = xid
+                if os.name == 'nt': # Windows
+                    self.video_player.set_hwnd(xid)
+                else:
+                    self.video_player.set_xwindow(xid)
+            self.window.after(50, self.start_video)
+            self.wakeup.watch()
 
-    def get_delay(self):
+    def expect(self, channel, length):
         """
-        Get the delay and reset playing state if delay is zero.
+        Remember the length of the media that starts on a channel and stop it
+        if it has not ended long after that.
         """
-        self.delay = max([self.video_player.get_length(),
-                          self.audio_player.get_length()])
+        self.plays += 1
+        self.length[channel] = length or 0
+        if length:
+            self.window.after(length + OVERRUN, self.overrun, channel, self.plays)
 
-        if "State.Playing" in [str(self.audio_player.get_state()),
-                               str(self.video_player.get_state())]:
-            self.window.after(100, self.get_delay)
-        else:
-            self.stop_playing()
+    def overrun(self, channel, play):
+        """
+        Stop a playback that did not end in time.
+        """
+        if play != self.plays or not self.playing:
+            return
+        print(f"Playback on {channel} player did not end after {self.length[channel]} ms")
+        (self.audio_player if channel == "audio" else self.video_player).stop()
+        self.finish(channel)
 
-    def stop_playing(self):
+    @traced
+    def set_media(self, channel, player, source):
         """
-        Reset the playing state after playback is over.
+        Set the media of a player from a path or a file object of a quiz pack.
         """
+        media, handle = VLC.media(source)
+        player.set_media(media)
+        SOURCES.pop(self.sources.pop(channel, None), None)
+        if handle:
+            self.sources[channel] = handle
+
+    def stop(self):
+        """
+        Stop playback on both channels and drop waiting media without calling their callbacks.
+        """
+        self.pending = []
+        self.callbacks = {}
+        self.started = {}
+        for player in [self.audio_player, self.video_player] + self.voices:
+            if player:
+                player.stop()
         self.playing = False
-        self.delay = 0
+        # events of the stopped media must not end the next one
+        while not self.events.empty():
+            self.events.get_nowait()
+
+    @traced
+    def start_video(self):
+        """
+        Start the video player once the widget is mapped.
+        """
+        if self.video_player.play() == -1:
+            self.finish("video")
+
+    def vlc_event(self, event, channel, kind):
+        """
+        Queue a vlc event for the tkinter thread. Called from a vlc thread.
+        """
+        if kind == "length":
+            self.events.put((channel, kind, event.u.new_length))
+        else:
+            self.events.put((channel, kind, None))
+        self.wakeup.wake()
+
+    def busy(self):
+        """
+        Return whether something plays and vlc events are expected.
+        """
+        return bool(self.playing or self.started)
+
+    @traced
+    def handle_events(self):
+        """
+        Handle all vlc events that arrived since the last call.
+        """
+        while True:
+            try:
+                channel, kind, value = self.events.get_nowait()
+            except queue.Empty:
+                return
+            if TRACER.enabled:
+                TRACER.instant(f"vlc {kind}", {"channel": channel, "value": value})
+            if kind == "length":
+                if channel in self.length:
+                    self.length[channel] = value
+            else:
+                if kind == "error":
+                    print(f"Playback error on {channel} player")
+                self.finish(channel)
+
+    def finish(self, channel):
+        """
+        Reset the playing state after playback is over and continue with waiting media.
+        """
+        if channel in self.length:
+            self.playing = False
+            self.length[channel] = 0
+        else:
+            self.started.pop(channel, None)
+        on_done = self.callbacks.pop(channel, None)
+        if on_done:
+            on_done()
+        if self.pending and not self.playing:
+            self.pending.pop(0)()
+
+
+VLC = VlcBackend()
+
+
+class SilentPlayer:
+    """
+    Stand-in for Player that plays nothing and reports every file as played at once.
+    Used when recorded games are replayed.
+    """
+    def __init__(self, window):
+        self.window = window
+
+    def setup(self):
+        """
+        Nothing to set up.
+        """
+
+    def play_effect(self, _, on_done=None):
+        """
+        Skip a sound effect.
+        """
+        if on_done:
+            self.window.after_idle(on_done)
+
+    # pylint: disable=unused-argument
+    def play_audio(self, _, retry=True, on_done=None, length=None):
+        """
+        Skip an audio file.
+        """
+        self.play_effect(None, on_done)
+
+    def play_video(self, _, widget, retry=True, on_done=None, length=None):
+        """
+        Skip a video file.
+        """
+        self.play_effect(None, on_done)
+
+    def stop(self):
+        """
+        Nothing to stop.
+        """
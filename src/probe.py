@@ -0,0 +1,208 @@
+"""
+Probing of solution files for duration, dimensions and codec when a quiz is loaded.
+
+The probe runs in the background and only reads the paths of the solution
+files, so the questions of a compiled quiz stay undecoded. Questions look up
+their results when they are revealed.
+"""
+
+import os
+import json
+import threading
+
+from PIL import Image
+
+from src.assetcache import CACHE_DIR
+from src.player import SOURCES, VLC
+
+PARSE_TIMEOUT = 5000
+WAIT_INTERVAL = 100
+
+
+class MediaProbe:
+    """
+    Probes solution files in the background and caches the results across runs.
+    """
+    def __init__(self, path=os.path.join(CACHE_DIR, "probe.json"), workers=4):
+        self.path = path
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.results = {}
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                self.results = json.load(cache_file)
+        except (OSError, ValueError):
+            pass
+
+    def probe_questions(self, questions, window=None, on_done=None):
+        """
+        Probe the solution files of a board in a background thread.
+        on_done is called on the tkinter thread of window with a list of warnings.
+        """
+        warnings = []
+        thread = threading.Thread(target=self.run, args=(questions, warnings), daemon=True)
+        thread.start()
+        if window and on_done:
+            window.after(WAIT_INTERVAL, self.wait, thread, window, warnings, on_done)
+        return thread
+
+    def wait(self, thread, window, warnings, on_done):
+        """
+        Call on_done with the warnings once the probe is done, polled on the tkinter thread.
+        """
+        if thread.is_alive():
+            window.after(WAIT_INTERVAL, self.wait, thread, window, warnings, on_done)
+        else:
+            on_done(warnings)
+
+    def run(self, questions, warnings=None):
+        """
+        Probe the solution files of a board in parallel and store the results.
+        Returns the warnings, which are also added to warnings if given.
+        """
+        # pylint: disable=import-outside-toplevel
+        # imported here to keep it off the startup path, run is called in the background
+        from concurrent.futures import ThreadPoolExecutor
+        # the questions of src.quizfile look up their results here
+        from src.quizfile import media_files
+        warnings = [] if warnings is None else warnings
+        files = media_files(questions)
+        with ThreadPoolExecutor(self.workers) as pool:
+            results = pool.map(self.try_probe, files,
+                               [media_type for media_type, _ in files.values()],
+                               [pack for _, pack in files.values()])
+            for solution_file, info in zip(files, results):
+                if info["error"]:
+                    warnings.append(f"Could not probe {solution_file}: {info['error']}")
+        self.save()
+        return warnings
+
+    def info(self, path, pack=None):
+        """
+        Return the probe result of a solution file, or None if it was not probed.
+        """
+        with self.lock:
+            return self.results.get(probe_key(path, pack))
+
+    def try_probe(self, path, media_type, pack=None):
+        """
+        Probe a file, a file that can not be probed is reported in the result.
+        """
+        try:
+            return self.probe(path, media_type, pack)
+        except Exception as error: # pylint: disable=broad-except
+            # one broken file must not stop the probe of all others
+            return empty_info(f"{type(error).__name__}: {error}")
+
+    def probe(self, path, media_type, pack=None):
+        """
+        Return duration, dimensions and codec of a file, probing it only if it changed.
+        The file is read from pack if given.
+        """
+        if pack:
+            stat = list(pack.stat(path))
+        else:
+            try:
+                stat = os.stat(path)
+            except OSError as error:
+                return empty_info(str(error))
+            stat = [stat.st_size, stat.st_mtime_ns]
+        key = probe_key(path, pack)
+
+        with self.lock:
+            cached = self.results.get(key)
+        if cached and cached["stat"] == stat:
+            return cached
+
+        source = pack.open(path) if pack else path
+        if media_type == "image":
+            info = probe_image(source)
+        else:
+            info = probe_media(source)
+        info["stat"] = stat
+        if not info["error"]:
+            with self.lock:
+                self.results[key] = info
+        return info
+
+    def save(self):
+        """
+        Write the probe results to the cache file.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self.lock, open(self.path + ".tmp", "w", encoding="utf-8") as cache_file:
+                json.dump(self.results, cache_file)
+            os.replace(self.path + ".tmp", self.path)
+        except OSError as error:
+            print(f"Could not save probe results: {error}")
+
+
+def probe_key(path, pack=None):
+    """
+    Return the key of a solution file in the probe results.
+    """
+    if pack:
+        return os.path.abspath(pack.path) + "!" + path
+    return os.path.abspath(path)
+
+
+def probe_image(path):
+    """
+    Read the dimensions and format of an image from its header, given as path or file object.
+    """
+    info = empty_info()
+    try:
+        with Image.open(path) as img:
+            info["width"], info["height"] = img.size
+            info["codec"] = img.format
+    except OSError as error:
+        info["error"] = str(error)
+    return info
+
+
+def probe_media(path):
+    """
+    Parse an audio or video file with vlc to get its duration, dimensions and codec.
+    The file is given as path or file object.
+    """
+    info = empty_info()
+    vlc = VLC.load()
+    media, handle = VLC.media(path)
+    parsed = threading.Event()
+    media.event_manager().event_attach(vlc.EventType.MediaParsedChanged,
+                                       lambda _: parsed.set())
+    media.parse_with_options(vlc.MediaParseFlag.local, PARSE_TIMEOUT)
+    parsed.wait(PARSE_TIMEOUT/1000 + 1)
+    SOURCES.pop(handle, None)
+    if media.get_parsed_status() != vlc.MediaParsedStatus.done:
+        info["error"] = f"parsing {media.get_parsed_status()}"
+        return info
+
+    info["duration"] = media.get_duration()
+    for track in media.tracks_get() or []:
+        if not info["codec"]:
+            info["codec"] = fourcc(track.codec)
+        video = getattr(track, "video", None)
+        if track.type == vlc.TrackType.video and video:
+            info["codec"] = fourcc(track.codec)
+            info["width"] = video.contents.width
+            info["height"] = video.contents.height
+    return info
+
+
+def empty_info(error=None):
+    """
+    Return a probe result without any information.
+    """
+    return {"duration": None, "width": None, "height": None, "codec": None, "error": error}
+
+
+def fourcc(code):
+    """
+    Convert a vlc codec id to its four character code.
+    """
+    return "".join(chr((code >> shift) & 0xff) for shift in (0, 8, 16, 24)).strip()
+
+
+PROBE = MediaProbe()
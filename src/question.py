@@ -4,33 +4,37 @@ Logic for questions.
 import os.path
 
 import random
-import tkinter as tk
+from functools import partial
 
-from PIL import Image, ImageTk, ImageFilter
+from src.mediacache import MEDIA_CACHE
+from src.probe import PROBE
+from src.tracing import traced
 
 VIDEO_FORMATS = ["mp4", "mov"]
 AUDIO_FORMATS = ["mp3", "wav"]
+IMAGE_DURATION = 7000
+ERROR_DURATION = 2000
 
 class Question:
     """
     Class that describes questions.
     """
-    def __init__(self, conf):
-        self.played = False
-        self.delay = 0
+    def __init__(self, conf, checked=False):
         self.question = conf[0]
         self.solution = conf[1]
         self.answers = conf[1:5]
         random.shuffle(self.answers)
         self.points = int(conf[5])
-        if os.path.isfile(conf[6]):
-            self.solution_file = conf[6]
-            if not "mp3" in self.solution_file:
-                self.images = []
+        if checked or os.path.isfile(conf[6]):
+            self.solution_file = conf[6] or None
         else:
             if conf[6]:
                 print(f"Invalid path: {conf[6]}")
             self.solution_file = None
+        self.media_type = get_media_type(self.solution_file)
+        self.round = conf[7] if len(conf) > 7 else ""
+        self.media_stat = None
+        self.pack = None
 
     def check_answer(self, a_nr):
         """
@@ -40,68 +44,87 @@ class Question:
             return True
         return False
 
-    def get_answer(self, parent):
+    def open_solution(self):
         """
-        Return the answer to the question.
+        Return the path of the solution file, or a file object if it is in a quiz pack.
+        """
+        if self.pack:
+            return self.pack.open(self.solution_file)
+        return self.solution_file
+
+    def reveal_duration(self):
+        """
+        Return how long the solution is shown in ms, or None if it is not known yet.
         """
         if not self.solution_file:
+            return 0
+        if self.media_type == "image":
+            return IMAGE_DURATION
+        info = PROBE.info(self.solution_file, self.pack)
+        # vlc reports -1 if it could not tell the duration
+        if info and info["duration"] and info["duration"] > 0:
+            return info["duration"]
+        return None
+
+    @traced
+    def get_answer(self, parent, on_done):
+        """
+        Return the answer to the question and call on_done once it was shown.
+        """
+        if not self.solution_file:
+            on_done()
             return
-        if self.solution_file.split(".")[-1] in AUDIO_FORMATS:
-            parent.player.play_audio(self.solution_file)
+        if self.media_type == "audio":
+            parent.player.play_audio(self.open_solution(), on_done=on_done,
+                                     length=self.reveal_duration())
             return
 
-        self.show_answer(parent)
+        self.show_answer(parent, on_done)
         return
 
-    def show_answer(self, parent):
+    @traced
+    def show_answer(self, parent, on_done):
         """
-        Show the image to the result.
+        Show the image or video of the solution on the reveal surface.
         """
-        width = 1280
-        height = 720
-        canvas = tk.Canvas(width=width*parent.scale,
-                           height=height*parent.scale, bg='black')
-        canvas.place(x=int(parent.offset[0]+parent.scale*(1920-width)/2),
-                     y=int(parent.offset[1]+parent.scale*200))
-        width = int(1280*parent.scale)
-        height = int(720*parent.scale)
+        surface = parent.reveal
+        if self.media_type == "video":
+            parent.player.play_video(self.open_solution(), surface.show_video(),
+                                     on_done=partial(self.hide_answer, parent, on_done),
+                                     length=self.reveal_duration())
+            return
 
-        if self.solution_file.split(".")[-1] in VIDEO_FORMATS:
-            parent.player.play_video(self.solution_file, canvas)
+        try:
+            background, foreground = MEDIA_CACHE.get(self.solution_file, parent.scale, self.pack,
+                                                     parent.game.renditions)
+        except OSError:
+            print(f"Could not load: {self.solution_file}")
+            surface.show_error()
+            duration = ERROR_DURATION
         else:
-            try:
-                img = Image.open(self.solution_file)
-            except FileNotFoundError:
-                self.delay = 2000
-
-            im_width, im_height = img.size
-
-            if im_width > width:
-                scale = width/im_width
-                img = img.resize((int(im_width*scale), int(im_height*scale)), Image.ANTIALIAS)
-                im_width, im_height = img.size
+            surface.show_image(background, foreground)
+            duration = IMAGE_DURATION
 
-            if im_height > height:
-                scale = height/im_height
-                img = img.resize((int(im_width*scale), int(im_height*scale)), Image.ANTIALIAS)
+        parent.window.after(duration, self.hide_answer, parent, on_done)
 
-            blurred = ImageTk.PhotoImage(img.resize((width, height), Image.ANTIALIAS).filter(
-                ImageFilter.GaussianBlur(radius=10)))
-            self.images.append(blurred)
-            canvas.create_image(0, 0, image=self.images[0], anchor=tk.NW)
-
-            image = ImageTk.PhotoImage(img)
-            self.images.append(image)
-
-            canvas.create_image(int((width-image.width())/2), int((height-image.height())/2),
-                                image=self.images[1], anchor=tk.NW)
-            self.delay = 7000
-
-        parent.window.after(2000, self.disable_canvas, parent, canvas)
-
-    def disable_canvas(self, parent, canvas):
+    @staticmethod
+    def hide_answer(parent, on_done):
         """
-        Disable canvas after video is played.
+        Hide the reveal surface after the solution was shown.
         """
-        delay = max(self.delay, parent.player.delay)
-        parent.window.after(delay, canvas.place_forget)
+        parent.reveal.hide()
+        on_done()
+
+
+def get_media_type(solution_file):
+    """
+    Return whether a solution file is a video, audio or image file.
+    """
+    if not solution_file:
+        return None
+    extension = solution_file.split(".")[-1].lower()
+    if extension in VIDEO_FORMATS:
+        return "video"
+    if extension in AUDIO_FORMATS:
+        return "audio"
+    return "image"
@@ -3,65 +3,118 @@ Functionality that shows all available questions.
 """
 
 import tkinter as tk
-from functools import partial
+
+from src.engine import tile_name
+from src.recorder import RECORDER
+from src.tracing import traced
 
 
 class QuestionBoard:
     """
     Question board to show which question to ask.
+
+    All question tiles are items on one canvas, so the whole board is shown
+    or hidden with a single call.
     """
     def __init__(self, parent, questions):
         self.parent = parent
-        self.game = parent.game
         self.framework = parent
-        self.questions = questions
-        self.buttons, self.positions = self.create_question_buttons()
+        self.canvas = tk.Canvas(self.framework.window, highlightthickness=0, borderwidth=0,
+                                bg="black")
+        self.canvas.tag_bind("tile", "<Button-1>", self.tile_clicked)
+        self.parent.layout.on_rescale(self.redraw)
         self.winner_buttons = []
+        self.pending = []
+        self.load(questions)
+        self.show_buttons()
+
+    def load(self, questions):
+        """
+        Draw the board for the questions of a new game.
+        """
+        self.game = self.parent.game
+        self.questions = questions
+        self.colors = {}
+        self.remove_winner_buttons()
+        self.top = 580 - len(self.questions)*170/2
+        self.height = max(1, len(self.questions))*160 - 30
+        self.parent.layout.add(self.canvas, 0, self.top, 1920, self.height)
+        self.canvas.delete("all")
+        self.buttons, self.actions = self.create_question_buttons()
 
     def create_question_buttons(self):
         """
-        Create the question buttons.
+        Create the question tiles on top of the matching part of the background.
         """
         buttons = {}
-        positions = {}
-        y_start = 580 - len(self.questions)*170/2
+        actions = {}
+        scale = self.parent.scale
+        box = (0, int(self.top*scale), int(1920*scale),
+               int(self.top*scale) + int(self.height*scale))
+        self.background = self.framework.background_crop(box)
+        self.canvas.create_image(0, 0, image=self.background, anchor=tk.NW)
+
+        font = self.parent.get_font(25)
         for j, points in enumerate(self.questions):
+            start = (1980 - 180*len(self.questions[points]))/2
             for i in range(len(self.questions[points])):
-                num = f"{chr(ord('a') + j).upper()}{i+1}"
-                text = num + "\n" + str(points)
-                action = partial(self.game.ask_question, num, points, i)
-                button = tk.Button(self.framework.window, text=text, command=action,
-                                   bg="#ffffff", font=self.parent.get_font(25))
-                start = (1980 - 180*len(self.questions[points]))/2
-                x_pos = self.parent.offset[0] + int((start+i*180)*self.parent.scale)
-                y_pos = self.parent.offset[1] + int((y_start+j*160)*self.parent.scale)
-                button.place(x=x_pos, y=y_pos,
-                             width=int(130*self.parent.scale), height=int(130*self.parent.scale))
-                buttons[num] = button
-                positions[num] = (x_pos, y_pos)
-        return buttons, positions
+                num = tile_name(j, i)
+                x_pos = int((start+i*180)*scale)
+                y_pos = int(j*160*scale)
+                rect = self.canvas.create_rectangle(x_pos, y_pos, x_pos + int(130*scale),
+                                                    y_pos + int(130*scale),
+                                                    fill=self.colors.get(num, "#ffffff"),
+                                                    outline="#5a5a5a", tags=("tile", num))
+                self.canvas.create_text(x_pos + int(65*scale), y_pos + int(65*scale),
+                                        text=num + "\n" + str(points), font=font,
+                                        justify="center", tags=("tile", num))
+                buttons[num] = rect
+                actions[num] = (points, i)
+        return buttons, actions
+
+    def redraw(self):
+        """
+        Draw the tiles again for a new scale.
+        """
+        self.canvas.delete("all")
+        self.buttons, self.actions = self.create_question_buttons()
 
+    @traced
+    def tile_clicked(self, _):
+        """
+        Ask the question of the clicked tile.
+        """
+        for tag in self.canvas.gettags("current"):
+            if tag in self.actions:
+                self.game.ask_question(tag, *self.actions[tag])
+                return
+
+    @traced
     def show_buttons(self):
         """
         Show buttons.
         """
-        for button in self.buttons:
-            (x_pos, y_pos) = self.positions[button]
-            self.buttons[button].place(x=x_pos, y=y_pos, width=int(130*self.parent.scale),
-                                       height=int(130*self.parent.scale))
+        self.parent.layout.show(self.canvas)
 
+    @traced
     def hide_buttons(self):
         """
         Hide buttons.
         """
-        for button in self.buttons:
-            self.buttons[button].place_forget()
+        self.parent.layout.hide(self.canvas)
 
     def set_button_color(self, color):
         """
         Set the color of a won button.
         """
-        self.buttons[self.game.current_question].config(bg=color, activebackground=color)
+        self.color_tile(self.game.current_question, color)
+
+    def color_tile(self, num, color):
+        """
+        Fill a tile with a color that is kept when the board is drawn again.
+        """
+        self.colors[num] = color
+        self.canvas.itemconfig(self.buttons[num], fill=color)
 
     def add_winner_button(self):
         """
@@ -74,26 +127,35 @@ class QuestionBoard:
                              bg="#f5d60f", activebackground="#f5d60f", font=self.parent.get_font(25)
                              )
         if self.game.players["red"] >= self.game.players["blue"]:
-            button_r.place(x=self.parent.offset[0]+1580*self.parent.scale,
-                           y=self.parent.offset[1]+20*self.parent.scale,
-                           width=300*self.parent.scale, height=120*self.parent.scale)
+            self.parent.layout.place(button_r, 1580, 20, 300, 120)
             self.winner_buttons.append(button_r)
         if self.game.players["red"] <= self.game.players["blue"]:
-            button_b.place(x=self.parent.offset[0]+100*self.parent.scale,
-                           y=self.parent.offset[1]+20*self.parent.scale,
-                           width=300*self.parent.scale, height=120*self.parent.scale)
+            self.parent.layout.place(button_b, 100, 20, 300, 120)
             self.winner_buttons.append(button_b)
 
+    def remove_winner_buttons(self):
+        """
+        Remove the winner buttons and stop coloring the board for the winner.
+        """
+        for after_id in self.pending:
+            self.framework.window.after_cancel(after_id)
+        self.pending = []
+        for button in self.winner_buttons:
+            self.parent.layout.remove(button)
+            button.destroy()
+        self.winner_buttons = []
+
     def winner_called(self):
         """
         Winner has been called.
         """
+        RECORDER.record("celebrate")
         for button in self.buttons:
-            self.buttons[button].config(bg="#ffffff", activebackground="#ffffff")
+            self.color_tile(button, "#ffffff")
 
         for i, button in enumerate(self.buttons):
-            self.framework.window.after(1000*(i+1), self.set_button, button, i)
-        self.parent.player.play_audio("gameplay/winner.mp3")
+            self.pending.append(self.framework.window.after(1000*(i+1), self.set_button, button, i))
+        self.parent.player.play_effect("gameplay/winner.mp3")
 
     def set_button(self, button, i):
         """
@@ -108,5 +170,5 @@ class QuestionBoard:
                 winner = "blue"
             else:
                 winner = "red"
-        self.buttons[button].config(bg=winner, activebackground=winner)
+        self.color_tile(button, winner)
         self.framework.title.config(fg=winner)
@@ -7,132 +7,130 @@ if it is answered correctly.
 import tkinter as tk
 from functools import partial
 
+from src.engine import LOGGED, CORRECT, WRONG
+from src.recorder import RECORDER
+from src.textfit import TextFitter
+from src.tracing import traced
+
+QUESTION_SIZE = 40
+ANSWER_SIZE = 25
+# space for the text inside the widgets, in design space
+QUESTION_BOX = (960, 170)
+ANSWER_BOX = (460, 160)
+
 class QuestionScreen:
     """
     Handle the screen that is used to ask a question.
     """
     def __init__(self, parent):
         self.parent = parent
-        self.elements, self.positions = self.create_elements()
+        self.fitter = TextFitter(parent.layout)
+        self.elements = self.create_elements()
         self.disable_elements()
-        self.question_info = {
-            "question": None,
-            "answer_logged_in": -1,
-            "wrong_answers": [],
-            "active_team": "blue"
-        }
+        self.parent.layout.on_rescale(self.rescale)
 
     def create_elements(self):
         """
         Create elements to ask a question.
         """
         elements = {}
-        positions = {}
 
-        question = tk.Text(self.parent.window, height=3, width=31)
-        x_pos = self.parent.offset[0] + int(460*self.parent.scale)
-        y_pos = self.parent.offset[1] + int(300*self.parent.scale)
-        question.place(x=x_pos, y=y_pos)
-        question.insert(tk.END, "Frage: Warum ist hier kein text?")
-        question.config(font=self.parent.get_font(), wrap=tk.WORD)
+        question = tk.Label(self.parent.window, text="Frage: Warum ist hier kein text?",
+                            font=self.parent.get_font(QUESTION_SIZE), bg="#ffffff",
+                            wraplength=int(QUESTION_BOX[0]*self.parent.scale))
+        self.parent.layout.add(question, 460, 300, 1000, 180)
 
         elements["question"] = question
-        positions["question"] = (x_pos, y_pos, int(1000*self.parent.scale),
-                                 int(180*self.parent.scale))
         for answer in [0, 1, 2, 3]:
             action = partial(self.login_answer, answer)
             button = tk.Button(self.parent.window, text=str(f"Antwort {answer+1}"), command=action,
-                               bg="#ffffff", font=self.parent.get_font(25),
-                               wraplength=int(500*self.parent.scale))
-            x_pos = self.parent.offset[0] + int((460+(answer%2)*510)*self.parent.scale)
-            y_pos = self.parent.offset[1] + int((500+int(answer/2)*200)*self.parent.scale)
-            button.place(x=x_pos, y=y_pos, height=100, width=100)
+                               bg="#ffffff", font=self.parent.get_font(ANSWER_SIZE),
+                               wraplength=int(ANSWER_BOX[0]*self.parent.scale))
+            self.parent.layout.add(button, 460+(answer%2)*510, 500+int(answer/2)*200, 490, 180)
             elements[answer] = button
-            positions[answer] = (x_pos, y_pos, int(490*self.parent.scale),
-                                 int(180*self.parent.scale))
 
-        return elements, positions
+        return elements
 
+    def rescale(self):
+        """
+        Adapt the line wrapping to a new scale and fit the texts of the round again.
+        """
+        self.elements["question"].config(wraplength=int(QUESTION_BOX[0]*self.parent.scale))
+        for answer in [0, 1, 2, 3]:
+            self.elements[answer].config(wraplength=int(ANSWER_BOX[0]*self.parent.scale))
+        if self.parent.game:
+            self.prepare(self.parent.game.questions)
 
+    @traced
+    def prepare(self, questions):
+        """
+        Fit the font sizes of all questions and answers of a board ahead of time.
+        """
+        for points in questions:
+            for question in questions[points]:
+                self.fitter.fit(question.question, QUESTION_BOX, QUESTION_SIZE)
+                for answer in question.answers:
+                    self.fitter.fit(answer, ANSWER_BOX, ANSWER_SIZE)
+
+    @traced
     def enable_elements(self):
         """
         Enable all elements.
         """
         for element in self.elements:
-            x_pos, y_pos, width, height = self.positions[element]
-            self.elements[element].place(x=x_pos, y=y_pos, height=height, width=width)
+            self.parent.layout.show(self.elements[element])
 
     def disable_elements(self):
         """
         Disable all elements.
         """
         for element in self.elements:
-            self.elements[element].place_forget()
+            self.parent.layout.hide(self.elements[element])
 
+    @traced
     def set_elements(self, question, active_team):
         """
-        Set the elements of the questions.
+        Set the elements of the questions with the largest font that fits each of them.
         """
-        self.question_info["active_team"] = active_team
-        self.question_info["question"] = question
-        self.elements["question"].config(state="normal", fg=active_team)
-        self.elements["question"].delete("1.0", tk.END)
-        self.elements["question"].insert(tk.END, question.question)
-        self.elements["question"].config(state="disabled")
+        size = self.fitter.fit(question.question, QUESTION_BOX, QUESTION_SIZE)
+        self.elements["question"].configure(text=question.question, fg=active_team,
+                                            font=self.parent.get_font(size))
         for i in range(4):
-            self.elements[i].configure(text=question.answers[i],
+            size = self.fitter.fit(question.answers[i], ANSWER_BOX, ANSWER_SIZE)
+            self.elements[i].configure(text=question.answers[i], font=self.parent.get_font(size),
                                        bg="#ffffff", activebackground="#ffffff")
 
-        self.question_info["answer_logged_in"] = -1
-
-
+    @traced
     def login_answer(self, button_nr):
         """
         Mark answer yellow and wait for comfirmation.
         """
-        if self.question_info["question"].played:
-            return
-        if self.question_info["answer_logged_in"] != button_nr: # we log in the answer
-            self.question_info["answer_logged_in"] = button_nr
+        engine = self.parent.game.engine
+        if RECORDER.enabled and engine.question:
+            # by text, the answers of compiled quizzes may be shuffled in another order
+            RECORDER.record("answer", nr=button_nr, answer=engine.question.answers[button_nr])
+        result = self.parent.game.select_answer(button_nr)
+        if result == LOGGED: # we log in the answer
             for button in range(4):
-                if button in self.question_info["wrong_answers"]:
+                if button in engine.wrong_answers:
                     continue
                 if button == button_nr:
                     self.elements[button].configure(bg="#f5c242", activebackground="#f5c242")
                 else:
                     self.elements[button].configure(bg="#ffffff", activebackground="#ffffff")
-        else: # logged in answer has been choosen
-            if self.question_info["question"].check_answer(self.question_info["answer_logged_in"]):
-                self.question_info["question"].played = True
-                self.elements[button_nr].configure(bg="#44ff00", activebackground="#44ff00")
-                self.question_info["answer_logged_in"] = -1
-                self.question_info["wrong_answers"] = []
-                self.parent.player.play_audio("gameplay/right.mp3", False)
-                self.parent.window.after(1500, self.question_info["question"].get_answer,
-                                         self.parent)
-                self.parent.window.after(3000, self.get_solution)
-
-            else:
-                self.parent.player.play_audio("gameplay/sadTone.mp3", False)
-
-                if self.question_info["active_team"] == "blue":
-                    self.question_info["active_team"] = "red"
-                else:
-                    self.question_info["active_team"] = "blue"
-                self.elements[button_nr].configure(bg="#b52d00", activebackground="#b52d00")
-                self.elements["question"].config(state="normal",
-                                                 fg=self.question_info["active_team"])
-                self.elements["question"].delete("1.0", tk.END)
-                self.elements["question"].insert(tk.END, self.question_info["question"].question)
-                self.elements["question"].config(state="disabled")
-                self.parent.title.config(fg=self.question_info["active_team"])
-                self.question_info["wrong_answers"].append(button_nr)
-                self.question_info["answer_logged_in"] = -1
+        elif result == CORRECT: # logged in answer has been choosen
+            self.elements[button_nr].configure(bg="#44ff00", activebackground="#44ff00")
+            self.parent.player.play_effect(
+                "gameplay/right.mp3",
+                partial(engine.question.get_answer, self.parent, self.get_solution))
+        elif result == WRONG:
+            self.parent.player.play_effect("gameplay/sadTone.mp3")
+            self.elements[button_nr].configure(bg="#b52d00", activebackground="#b52d00")
+            self.elements["question"].configure(fg=engine.active_team)
+            self.parent.title.config(fg=engine.active_team)
 
     def get_solution(self):
         """
-        Return to the main window after delay.
+        Return to the main window after the solution was shown.
         """
-        delay = max([self.question_info["question"].delay, self.parent.player.delay])
-        self.parent.window.after(delay+3000, self.parent.game.question_answered,
-                                 self.question_info["active_team"], self.question_info["question"])
+        self.parent.game.question_answered()
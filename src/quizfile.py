@@ -0,0 +1,371 @@
+"""
+Reading quiz csv files, quiz packs and the compiled binary quiz format.
+
+A quiz can be split into rounds with the optional Round column. Every round
+is played on its own board, the questions of a round are a dict of points
+and the questions with these points, like a quiz without rounds.
+
+A compiled quiz stores the validated questions of a csv file together with
+the size and modification time of the csv file and of every solution file.
+It is memory-mapped on load and questions are only decoded when used. A
+solution file that changed or disappeared since then is noticed when its
+question is decoded, and the quiz is compiled again in the background.
+"""
+
+import os
+import csv
+import mmap
+import struct
+import threading
+from collections.abc import Sequence
+
+from src.question import Question, get_media_type
+from src.quizpack import PACK_EXTENSION, QuizPack, is_pack, write_pack
+
+MAGIC = b"QWC2"
+HEADER = struct.Struct("<4sQqII")
+BUCKET = struct.Struct("<IiII")
+OFFSET = struct.Struct("<Q")
+RECORD = struct.Struct("<iBQq")
+LENGTH = struct.Struct("<I")
+
+MEDIA_TYPES = [None, "image", "audio", "video"]
+COLUMNS = 8
+
+
+def compiled_path(config):
+    """
+    Return the path of the compiled file for a quiz csv file.
+    """
+    return os.path.splitext(config)[0] + ".qwc"
+
+
+def read_rows(config):
+    """
+    Read the rows of a quiz csv file or quiz pack without the header.
+    """
+    if is_pack(config):
+        csv_file = QuizPack(config).open_quiz()
+    else:
+        csv_file = open(config, encoding='utf-8')
+    with csv_file:
+        yield from parse_rows(csv_file)
+
+
+def parse_rows(csv_file):
+    """
+    Read the rows of an open quiz csv file without the header.
+    """
+    reader = csv.reader(csv_file)
+    next(reader, None)
+    for row in reader:
+        if not any(row):
+            continue
+        yield row + [""]*(COLUMNS-len(row))
+
+
+def add_question(rounds, question):
+    """
+    Add a question to the dict of rounds, in the order the rounds first appear.
+    """
+    questions = rounds.setdefault(question.round, {})
+    if question.points not in questions.keys():
+        questions[question.points] = []
+    questions[question.points].append(question)
+
+
+def read_questions(config):
+    """
+    Create the questions of every round from a csv file.
+    """
+    rounds = {}
+    for row in read_rows(config):
+        add_question(rounds, Question(row))
+    return list(rounds.items())
+
+
+def read_pack(config):
+    """
+    Create the questions of every round from a quiz pack.
+    Their solution files are read from the pack.
+    """
+    pack = QuizPack(config)
+    rounds = {}
+    with pack.open_quiz() as csv_file:
+        for row in parse_rows(csv_file):
+            question = Question(row, checked=row[6] in pack)
+            if row[6] in pack:
+                question.pack = pack
+                question.media_stat = pack.stat(row[6])
+            add_question(rounds, question)
+    return list(rounds.items())
+
+
+def load_rounds(config):
+    """
+    Create the questions of every round as a list of round name and questions,
+    from a quiz pack, the compiled quiz or from the csv file if it is stale.
+    """
+    if is_pack(config):
+        rounds = read_pack(config)
+    else:
+        rounds = load_compiled(config)
+        if rounds is None:
+            rounds = read_questions(config)
+    return rounds or [("", {})]
+
+
+def load_questions(config):
+    """
+    Create the questions of a quiz as a single board, the rounds of a quiz are merged.
+    """
+    rounds = load_rounds(config)
+    if len(rounds) == 1:
+        return rounds[0][1]
+    questions = {}
+    for _, board in rounds:
+        for points in board:
+            questions.setdefault(points, []).extend(board[points])
+    return questions
+
+
+def compile_quiz(config, target=None):
+    """
+    Validate a quiz csv file once and write it in the compiled format.
+    """
+    target = target or compiled_path(config)
+    rounds = {}
+    for line, row in enumerate(read_rows(config), start=2):
+        try:
+            points = int(row[5])
+        except ValueError:
+            print(f"{config}:{line}: invalid points {row[5]!r}, row skipped")
+            continue
+
+        media = (None, 0, 0)
+        if row[6]:
+            try:
+                stat = os.stat(row[6])
+                media = (row[6], stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                print(f"{config}:{line}: invalid path {row[6]}")
+        buckets = rounds.setdefault(row[7], {})
+        if points not in buckets:
+            buckets[points] = []
+        buckets[points].append((row[:5], media))
+
+    buckets = [(index, name, points, questions)
+               for index, (name, round_buckets) in enumerate(rounds.items())
+               for points, questions in round_buckets.items()]
+    records = []
+    for _, name, points, questions in buckets:
+        for texts, (path, size, mtime) in questions:
+            record = [RECORD.pack(points, MEDIA_TYPES.index(get_media_type(path)), size, mtime)]
+            for text in texts + [path or "", name]:
+                data = text.encode("utf-8")
+                record += [LENGTH.pack(len(data)), data]
+            records.append(b"".join(record))
+
+    stat = os.stat(config)
+    table = [HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, len(buckets), len(records))]
+    first = 0
+    for index, _, points, questions in buckets:
+        table.append(BUCKET.pack(index, points, len(questions), first))
+        first += len(questions)
+
+    offset = HEADER.size + BUCKET.size*len(buckets) + OFFSET.size*len(records)
+    for record in records:
+        table.append(OFFSET.pack(offset))
+        offset += len(record)
+
+    temp = target + ".tmp"
+    with open(temp, "wb") as out:
+        out.write(b"".join(table + records))
+    os.replace(temp, target)
+    return target
+
+
+def pack_quiz(config, target=None):
+    """
+    Write a quiz csv file and all its solution files into a single quiz pack.
+    """
+    target = target or os.path.splitext(config)[0] + PACK_EXTENSION
+    files = {}
+    for line, row in enumerate(read_rows(config), start=2):
+        if not row[6] or row[6] in files:
+            continue
+        if os.path.isfile(row[6]):
+            files[row[6]] = row[6]
+        else:
+            print(f"{config}:{line}: invalid path {row[6]}")
+    return write_pack(target, config, files)
+
+
+def load_compiled(config):
+    """
+    Load the compiled version of a quiz, or return None if it is missing or stale.
+    """
+    try:
+        stat = os.stat(config)
+        with open(compiled_path(config), "rb") as compiled:
+            data = mmap.mmap(compiled.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(data) < HEADER.size:
+        return None
+    magic, size, mtime, num_buckets, num_records = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or (size, mtime) != (stat.st_size, stat.st_mtime_ns):
+        return None
+
+    quiz = CompiledQuiz(data, num_buckets, num_records, config)
+    rounds = []
+    for bucket in range(num_buckets):
+        index, points, count, first = BUCKET.unpack_from(data, HEADER.size + bucket*BUCKET.size)
+        if index == len(rounds):
+            # the name of a round is stored with each of its questions
+            rounds.append((quiz.record(first)[0][7], {}))
+        rounds[index][1][points] = CompiledBucket(quiz, first, count)
+    return rounds
+
+
+class CompiledQuiz:
+    """
+    Memory-mapped compiled quiz that decodes records on demand.
+    """
+    def __init__(self, data, num_buckets, num_records, config=None):
+        self.data = data
+        self.num_records = num_records
+        self.offsets = HEADER.size + BUCKET.size*num_buckets
+        self.config = config
+        self.recompiling = False
+
+    def check_media(self, path, size, mtime):
+        """
+        Return the current size and mtime of a solution file, or None if it is missing.
+        If they differ from the compiled ones the quiz is compiled again.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            current = None
+        else:
+            current = (stat.st_size, stat.st_mtime_ns)
+        if current != (size, mtime):
+            self.recompile()
+        return current
+
+    def recompile(self):
+        """
+        Compile the quiz again in a background thread, once.
+        """
+        if self.config and not self.recompiling:
+            self.recompiling = True
+            print(f"Solution files of {self.config} changed, compiling it again")
+            threading.Thread(target=self.compile, daemon=True).start()
+
+    def compile(self):
+        """
+        Compile the quiz again. Runs in the background thread.
+        """
+        try:
+            compile_quiz(self.config)
+        except OSError as error:
+            # on Windows the mapped file can not be replaced while it is loaded
+            print(f"Could not compile {self.config}: {error}")
+
+    def record(self, index):
+        """
+        Decode a record into the question row, its media type, size and mtime.
+        """
+        offset = OFFSET.unpack_from(self.data, self.offsets + index*OFFSET.size)[0]
+        points, media, size, mtime = RECORD.unpack_from(self.data, offset)
+        offset += RECORD.size
+        texts = []
+        for _ in range(7):
+            length = LENGTH.unpack_from(self.data, offset)[0]
+            offset += LENGTH.size
+            texts.append(self.data[offset:offset+length].decode("utf-8"))
+            offset += length
+        row = texts[:5] + [str(points)] + texts[5:]
+        return row, MEDIA_TYPES[media], size, mtime
+
+    def media(self, index):
+        """
+        Decode only the solution file of a record with its media type, size and mtime.
+        """
+        offset = OFFSET.unpack_from(self.data, self.offsets + index*OFFSET.size)[0]
+        _, media, size, mtime = RECORD.unpack_from(self.data, offset)
+        offset += RECORD.size
+        for _ in range(5): # question and answers
+            offset += LENGTH.size + LENGTH.unpack_from(self.data, offset)[0]
+        length = LENGTH.unpack_from(self.data, offset)[0]
+        offset += LENGTH.size
+        path = self.data[offset:offset+length].decode("utf-8") or None
+        return path, MEDIA_TYPES[media], size, mtime
+
+
+class CompiledBucket(Sequence):
+    """
+    Questions of one points bucket that are created when first accessed.
+    """
+    def __init__(self, quiz, first, count):
+        self.quiz = quiz
+        self.first = first
+        self.questions = [None]*count
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        question = self.questions[index]
+        if question is None:
+            row, media_type, size, mtime = self.quiz.record(self.first + index)
+            stat = self.quiz.check_media(row[6], size, mtime) if row[6] else None
+            question = Question(row, checked=True)
+            if row[6] and stat is None:
+                print(f"Invalid path: {row[6]}")
+                question.solution_file = None
+                media_type = None
+            question.media_type = media_type
+            question.media_stat = stat
+            with self.lock:
+                # a question is only created once if two threads decode it
+                if self.questions[index] is None:
+                    self.questions[index] = question
+                question = self.questions[index]
+        return question
+
+    def media(self, index):
+        """
+        Return the solution file of a question and its media type without creating the question.
+        """
+        question = self.questions[index]
+        if question is not None:
+            return question.solution_file, question.media_type
+        return self.quiz.media(self.first + index)[:2]
+
+
+def media_files(questions):
+    """
+    Return the media type and quiz pack of every solution file of a board by its path.
+    The questions of a compiled quiz are not created for this.
+    """
+    files = {}
+    for points in questions:
+        bucket = questions[points]
+        if isinstance(bucket, CompiledBucket):
+            for index in range(len(bucket)):
+                path, media_type = bucket.media(index)
+                if path:
+                    files.setdefault(path, (media_type, None))
+        else:
+            for question in bucket:
+                if question.solution_file:
+                    files.setdefault(question.solution_file, (question.media_type, question.pack))
+    return files
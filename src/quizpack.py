@@ -0,0 +1,134 @@
+"""
+Single-file quiz packs that contain the quiz csv file and all solution files.
+
+A pack starts with a header pointing to a json manifest at its end, which maps
+every file name to its offset and size. Packs are memory-mapped once and files
+are read straight from the mapping.
+"""
+
+import io
+import os
+import json
+import mmap
+import shutil
+import struct
+
+MAGIC = b"QWP1"
+HEADER = struct.Struct("<4sQI")
+PACK_EXTENSION = ".qwp"
+
+
+def is_pack(path):
+    """
+    Return whether a quiz path is a quiz pack.
+    """
+    return path.lower().endswith(PACK_EXTENSION)
+
+
+def write_pack(target, quiz, files):
+    """
+    Write a pack with the quiz csv file and other files, given as a dict of name and path.
+    """
+    manifest = {"quiz": os.path.basename(quiz), "files": {}}
+    temp = target + ".tmp"
+    with open(temp, "wb") as out:
+        out.write(HEADER.pack(MAGIC, 0, 0))
+        for name, path in [(manifest["quiz"], quiz)] + list(files.items()):
+            with open(path, "rb") as source:
+                offset = out.tell()
+                shutil.copyfileobj(source, out)
+                manifest["files"][name] = [offset, out.tell() - offset]
+        data = json.dumps(manifest).encode("utf-8")
+        offset = out.tell()
+        out.write(data)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, offset, len(data)))
+    os.replace(temp, target)
+    return target
+
+
+class QuizPack:
+    """
+    Memory-mapped quiz pack.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as pack_file:
+            self.data = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(pack_file.fileno())
+        self.mtime = stat.st_mtime_ns
+        if len(self.data) < HEADER.size:
+            raise ValueError(f"{path} is not a quiz pack")
+        magic, offset, size = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a quiz pack")
+        manifest = json.loads(self.data[offset:offset+size].decode("utf-8"))
+        self.quiz = manifest["quiz"]
+        self.files = manifest["files"]
+        self.view = memoryview(self.data)
+
+    def __contains__(self, name):
+        return name in self.files
+
+    def open(self, name):
+        """
+        Return a read-only file object for a file in the pack.
+        """
+        offset, size = self.files[name]
+        return PackFile(self.view[offset:offset+size])
+
+    def open_quiz(self):
+        """
+        Return the quiz csv file as a text file object.
+        """
+        return io.TextIOWrapper(io.BufferedReader(self.open(self.quiz)), encoding="utf-8")
+
+    def stat(self, name):
+        """
+        Return size and modification time of a file in the pack, like the compiled format.
+        """
+        return self.files[name][1], self.mtime
+
+
+class PackFile(io.RawIOBase):
+    """
+    Seekable file object over a memoryview of a pack that copies directly into
+    the buffers of its readers.
+    """
+    def __init__(self, view):
+        super().__init__()
+        self.view = view
+        self.size = len(view)
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        target = memoryview(buffer).cast("B")
+        count = max(0, min(len(target), self.size - self.position))
+        target[:count] = self.view[self.position:self.position+count]
+        self.position += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self.position = offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def reopen(self):
+        """
+        Return a new file object for the same file.
+        """
+        return PackFile(self.view)
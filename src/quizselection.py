@@ -0,0 +1,165 @@
+"""
+Paged and searchable list to select a quiz.
+"""
+
+import tkinter as tk
+from functools import partial
+
+PAGE_SIZE = 7
+
+
+class QuizSelection:
+    """
+    Selection screen that shows one page of the quiz catalog and reuses the same
+    buttons for every page. Its widgets are created once and shown or hidden as a view.
+    """
+    def __init__(self, parent, catalog, action, version):
+        self.parent = parent
+        self.root = parent.window
+        self.catalog = catalog
+        self.action = action
+        self.version = version
+        self.quizzes = []
+        self.page = 0
+        self.widgets = []
+        self.create_title()
+        self.resolution = self.create_resolution()
+        self.search = self.create_search()
+        self.buttons = self.create_buttons()
+        self.navigation = self.create_navigation()
+
+    def add(self, widget, x_pos, y_pos, width=None, height=None):
+        """
+        Register a widget of the view with the layout.
+        """
+        self.parent.layout.add(widget, x_pos, y_pos, width, height)
+        self.widgets.append(widget)
+        return widget
+
+    def show(self):
+        """
+        Refresh the catalog and show the view.
+        """
+        self.quizzes = self.catalog.refresh()
+        self.search.delete(0, tk.END)
+        self.page = 0
+        self.show_page()
+        for widget in self.widgets:
+            self.parent.layout.show(widget)
+        self.search.focus_set()
+
+    def hide(self):
+        """
+        Hide the view.
+        """
+        for widget in self.widgets:
+            self.parent.layout.hide(widget)
+
+    def create_title(self):
+        """
+        Create the title and the version.
+        """
+        title = tk.Text(self.root, highlightthickness=0, borderwidth=0)
+        self.add(title, 710, 100, 500, 80)
+        title.tag_configure("center", justify='center')
+        title.insert(tk.END, "Select Quiz:")
+        title.tag_add("center", "1.0", "end")
+        title.config(font=self.parent.get_font(), wrap=tk.WORD, fg="black")
+        title.config(state="disabled")
+
+        version = tk.Text(self.root, highlightthickness=0, borderwidth=0)
+        self.add(version, 0, 1040, 100, 40)
+        version.tag_configure("center", justify='center')
+        version.insert(tk.END, "v" + self.version)
+        version.tag_add("center", "1.0", "end")
+        version.config(font=self.parent.get_font(20), wrap=tk.WORD, fg="black")
+        version.config(state="disabled")
+
+    def create_resolution(self):
+        """
+        Create the field and button to change the resolution.
+        """
+        entry = tk.Entry(self.root)
+        entry.insert(0, f"{self.root.winfo_screenwidth()}x{self.root.winfo_screenheight()}")
+        self.add(entry, 1800, 1000, 100, 50)
+        button = tk.Button(self.root, text="Change resolution",
+                           command=partial(self.parent.change_res, entry))
+        self.add(button, 1580, 1000, 200, 50)
+        return entry
+
+    def create_search(self):
+        """
+        Create the search field.
+        """
+        search = tk.Entry(self.root, font=self.parent.get_font(25), justify="center")
+        self.add(search, 710, 200, 500, 60)
+        search.bind("<KeyRelease>", self.filter_quizzes)
+        return search
+
+    def create_buttons(self):
+        """
+        Create one button for every entry on a page.
+        """
+        buttons = []
+        for i in range(PAGE_SIZE):
+            button = tk.Button(self.root, command=partial(self.choose, i))
+            buttons.append(self.add(button, 710, 290+i*90, 500, 80))
+        return buttons
+
+    def create_navigation(self):
+        """
+        Create the buttons to switch pages and the page label.
+        """
+        previous = tk.Button(self.root, text="<", command=partial(self.turn_page, -1))
+        self.add(previous, 710, 930, 80, 50)
+        label = tk.Label(self.root, bg="#ffffff")
+        self.add(label, 800, 930, 320, 50)
+        following = tk.Button(self.root, text=">", command=partial(self.turn_page, 1))
+        self.add(following, 1130, 930, 80, 50)
+        return {"previous": previous, "label": label, "next": following}
+
+    def filter_quizzes(self, _=None):
+        """
+        Show only the quizzes that match the search text.
+        """
+        self.quizzes = self.catalog.search(self.search.get())
+        self.page = 0
+        self.show_page()
+
+    def turn_page(self, direction):
+        """
+        Go to the previous or next page.
+        """
+        page = self.page + direction
+        if 0 <= page < self.num_pages():
+            self.page = page
+            self.show_page()
+
+    def num_pages(self):
+        """
+        Return the number of pages.
+        """
+        return max(1, -(-len(self.quizzes)//PAGE_SIZE))
+
+    def show_page(self):
+        """
+        Update the buttons with the quizzes of the current page.
+        """
+        first = self.page*PAGE_SIZE
+        for i, button in enumerate(self.buttons):
+            if first + i < len(self.quizzes):
+                entry = self.catalog.entries[self.quizzes[first+i]]
+                state = "disabled" if entry["error"] else "normal"
+                button.config(text=f"{entry['title']} ({entry['questions']})", state=state)
+            else:
+                button.config(text="", state="disabled")
+        self.navigation["label"].config(
+            text=f"{self.page+1}/{self.num_pages()} ({len(self.quizzes)} quizzes)")
+
+    def choose(self, i):
+        """
+        Select the quiz of a button.
+        """
+        index = self.page*PAGE_SIZE + i
+        if index < len(self.quizzes):
+            self.action(self.quizzes[index])
@@ -0,0 +1,58 @@
+"""
+Recording of the actions taken in the game, to replay a quiz night later.
+"""
+
+import os
+import json
+import time
+
+
+class Recorder:
+    """
+    Writes every action of the user as one json line when enabled.
+    The first line holds the seed the answers were shuffled with.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.file = None
+        self.start = None
+
+    def enable(self, path, seed, resolution=None):
+        """
+        Start a new recording.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "w", encoding="utf-8") # pylint: disable=consider-using-with
+        self.start = time.perf_counter()
+        self.enabled = True
+        self.write({"t": "start", "seed": seed, "resolution": resolution})
+
+    def record(self, kind, **action):
+        """
+        Record an action with the time it was taken at.
+        """
+        if self.enabled:
+            self.write({"t": kind, "at": round(time.perf_counter() - self.start, 3), **action})
+
+    def write(self, action):
+        """
+        Write one line, so the recording is complete even if the game is killed.
+        """
+        self.file.write(json.dumps(action) + "\n")
+        self.file.flush()
+
+
+def read_recording(path):
+    """
+    Return the header and the actions of a recording.
+    """
+    with open(path, encoding="utf-8") as recording:
+        lines = [json.loads(line) for line in recording if line.endswith("\n")]
+    if not lines or lines[0]["t"] != "start":
+        raise ValueError(f"{path} is not a recording")
+    return lines[0], lines[1:]
+
+
+RECORDER = Recorder()
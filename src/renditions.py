@@ -0,0 +1,185 @@
+"""
+Solution images rendered ahead of time for one screen resolution.
+
+A rendition set lives next to its quiz in a folder with one sub folder per reveal
+size. It holds the fitted foreground and the blurred backdrop of every solution
+image and a manifest with the size and modification time of each source, so
+unchanged files are skipped when a quiz is prepared again and the game only
+uses renditions that still match their source.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+from src.mediacache import REVEAL_SIZE, render_solution
+from src.quizfile import load_questions
+from src.quizpack import QuizPack
+
+VERSION = 1
+MANIFEST = "manifest.json"
+
+
+def rendition_dir(quiz, scale):
+    """
+    Return the folder of the renditions of a quiz for a scale.
+    """
+    width, height = reveal_size(scale)
+    return os.path.join(os.path.splitext(quiz)[0] + ".renditions", f"{width}x{height}")
+
+
+def reveal_size(scale):
+    """
+    Return the size of the reveal area at a scale.
+    """
+    return int(REVEAL_SIZE[0]*scale), int(REVEAL_SIZE[1]*scale)
+
+
+def source_stat(path, pack=None):
+    """
+    Return size and modification time of a solution file, read from pack if given.
+    """
+    if pack:
+        return list(pack.stat(path))
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def read_manifest(directory):
+    """
+    Return the entries of the manifest of a rendition folder, or an empty dict.
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as manifest:
+            data = json.load(manifest)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != VERSION:
+        return {}
+    return data["files"]
+
+
+def write_manifest(directory, files):
+    """
+    Write the manifest of a rendition folder without leaving partial files behind.
+    """
+    target = os.path.join(directory, MANIFEST)
+    with open(target + ".tmp", "w", encoding="utf-8") as manifest:
+        json.dump({"version": VERSION, "files": files}, manifest, indent=1)
+    os.replace(target + ".tmp", target)
+
+
+class Renditions:
+    """
+    Looks up prepared renditions of the solution images of one quiz.
+    """
+    def __init__(self, quiz):
+        self.quiz = quiz
+        self.manifests = {}
+
+    def get(self, path, scale, pack=None):
+        """
+        Return the paths of backdrop and foreground for a solution file,
+        or None if there is no rendition of the current version of it.
+        """
+        if scale not in self.manifests:
+            directory = rendition_dir(self.quiz, scale)
+            self.manifests[scale] = (directory, read_manifest(directory))
+        directory, files = self.manifests[scale]
+        entry = files.get(path)
+        if not entry:
+            return None
+        try:
+            if entry["stat"] != source_stat(path, pack):
+                return None
+        except OSError:
+            return None
+        return (os.path.join(directory, entry["background"]),
+                os.path.join(directory, entry["foreground"]))
+
+
+def render_file(quiz, path, scale, directory, packed):
+    """
+    Render one solution image into a rendition folder and return its manifest
+    entry and the time spent on each step. Runs in a worker process.
+    """
+    start = time.perf_counter()
+    pack = QuizPack(quiz) if packed else None
+    stat = source_stat(path, pack)
+    background, foreground = render_solution(pack.open(path) if pack else path, scale)
+    rendered = time.perf_counter()
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = f"{stem}-{hashlib.sha1(path.encode('utf-8')).hexdigest()[:10]}"
+    entry = {"stat": stat, "background": name + "-bg.jpg"}
+    background.convert("RGB").save(os.path.join(directory, entry["background"]),
+                                   format="JPEG", quality=90)
+    if foreground.mode in ("RGBA", "LA") or "transparency" in foreground.info:
+        entry["foreground"] = name + ".png"
+        foreground.save(os.path.join(directory, entry["foreground"]), format="PNG",
+                        compress_level=1)
+    else:
+        entry["foreground"] = name + ".jpg"
+        foreground.convert("RGB").save(os.path.join(directory, entry["foreground"]),
+                                       format="JPEG", quality=95)
+    return entry, {"render": rendered - start, "write": time.perf_counter() - rendered}
+
+
+def prepare_quiz(quiz, scale, workers=None):
+    """
+    Render all solution images of a quiz for a scale in a process pool,
+    skipping files whose rendition is up to date.
+    Returns the folder and a report of (path, status, seconds) for every file.
+    """
+    # only needed by this command, a process pool is slow to import
+    from concurrent.futures import ProcessPoolExecutor # pylint: disable=import-outside-toplevel
+    questions = load_questions(quiz)
+    directory = rendition_dir(quiz, scale)
+    os.makedirs(directory, exist_ok=True)
+    known = read_manifest(directory)
+
+    images = {}
+    for points in questions:
+        for question in questions[points]:
+            if question.media_type == "image":
+                images[question.solution_file] = question.pack
+
+    files = {}
+    report = []
+    jobs = {}
+    with ProcessPoolExecutor(workers) as pool:
+        for path, pack in images.items():
+            entry = known.get(path)
+            try:
+                current = entry and entry["stat"] == source_stat(path, pack) and all(
+                    os.path.isfile(os.path.join(directory, entry[f]))
+                    for f in ("background", "foreground"))
+            except OSError as error:
+                report.append((path, f"error: {error}", 0))
+                continue
+            if current:
+                files[path] = entry
+                report.append((path, "skipped", 0))
+                continue
+            jobs[path] = (pool.submit(render_file, quiz, path, scale, directory, pack is not None),
+                          time.perf_counter())
+
+        for path, (job, submitted) in jobs.items():
+            try:
+                entry, times = job.result()
+            except (OSError, ValueError) as error:
+                report.append((path, f"error: {error}", time.perf_counter() - submitted))
+                continue
+            files[path] = entry
+            report.append((path, f"rendered (render {1000*times['render']:.0f} ms, "
+                                 f"write {1000*times['write']:.0f} ms)",
+                           times["render"] + times["write"]))
+
+    used = {entry[key] for entry in files.values() for key in ("background", "foreground")}
+    for entry in known.values():
+        for name in (entry["background"], entry["foreground"]):
+            if name not in used and os.path.isfile(os.path.join(directory, name)):
+                os.remove(os.path.join(directory, name))
+    write_manifest(directory, files)
+    return directory, report
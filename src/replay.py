@@ -0,0 +1,142 @@
+"""
+Replay of recorded games through the tkinter front end to catch slowdowns.
+
+Media is not played and all delays of the game run at once, so a quiz night
+is replayed as fast as the widgets can follow. Every action is timed until
+the window is up to date again and compared with a baseline of an earlier run.
+"""
+
+import json
+import time
+import random
+import statistics
+
+from src.game import Framework
+from src.mediacache import MEDIA_CACHE
+from src.recorder import read_recording
+
+THRESHOLD = 0.2
+MIN_REGRESSION = 0.002
+
+
+def collapse_delays(window):
+    """
+    Run callbacks that the game schedules with a delay as soon as possible.
+    """
+    after = window.after
+
+    def instant(_, func=None, *args):
+        return after(0, func, *args) if func else None
+    window.after = instant
+
+
+def perform(framework, action):
+    """
+    Take a recorded action again.
+    """
+    kind = action["t"]
+    if kind == "quiz":
+        framework.start_game(action["quiz"])
+    elif kind == "pick":
+        framework.game.ask_question(action["num"], action["points"], action["i"])
+    elif kind == "buzz":
+        framework.game.buzz(action["team"])
+    elif kind == "answer":
+        answers = framework.game.engine.question.answers
+        framework.question_screen.login_answer(answers.index(action["answer"]))
+    elif kind == "fullscreen":
+        framework.full_screeen(None)
+    elif kind == "selection":
+        framework.show_selection()
+    elif kind == "round":
+        framework.next_round()
+    elif kind == "celebrate":
+        framework.question_board.winner_called()
+    else:
+        raise ValueError(f"unknown action {kind}")
+
+
+def step_name(index, action):
+    """
+    Return a name for an action that stays the same between replays.
+    """
+    details = " ".join(str(value) for key, value in action.items() if key not in ("t", "at"))
+    return f"{index:05} {action['t']} {details}".strip()
+
+
+def replay(path, resolution=None, quiz_dirs=None):
+    """
+    Replay a recording once and return the duration of every step in seconds.
+    """
+    header, actions = read_recording(path)
+    random.seed(header["seed"])
+    framework = Framework(quiz_dirs, None, resolution or header["resolution"] or (1920, 1080),
+                          mainloop=False, resume=False, replay=True)
+    collapse_delays(framework.window)
+    framework.window.update()
+    steps = {}
+    try:
+        for index, action in enumerate(actions):
+            start = time.perf_counter()
+            perform(framework, action)
+            framework.window.update()
+            steps[step_name(index, action)] = time.perf_counter() - start
+    finally:
+        if framework.game:
+            framework.game.close()
+        framework.window.destroy()
+        # the cached images belong to the window that was just destroyed
+        MEDIA_CACHE.clear()
+    return steps
+
+
+def replay_runs(path, runs=3, resolution=None, quiz_dirs=None):
+    """
+    Replay a recording several times and return the median duration of every step.
+    """
+    results = [replay(path, resolution, quiz_dirs) for _ in range(runs)]
+    return {name: statistics.median(result[name] for result in results)
+            for name in results[0]}
+
+
+def compare(steps, baseline, threshold=THRESHOLD, minimum=MIN_REGRESSION):
+    """
+    Return the steps that are slower than the baseline by more than threshold
+    and by at least minimum seconds, so tiny steps do not fail on noise.
+    """
+    regressions = []
+    for name, seconds in steps.items():
+        if name not in baseline:
+            continue
+        if seconds > baseline[name]*(1 + threshold) and seconds - baseline[name] >= minimum:
+            regressions.append((name, seconds, baseline[name]))
+    return regressions
+
+
+def run_replay(path, baseline_path=None, update=False, threshold=THRESHOLD, runs=3,
+               resolution=None, quiz_dirs=None):
+    """
+    Replay a recording, print the step timings and compare them with the baseline.
+    Returns 1 if a step regressed, otherwise 0.
+    """
+    baseline_path = baseline_path or path + ".baseline.json"
+    steps = replay_runs(path, runs, resolution, quiz_dirs)
+    for name, seconds in steps.items():
+        print(f"{name:60} {1000*seconds:10.2f} ms")
+    print(f"{len(steps)} steps in {sum(steps.values()):.2f} s")
+
+    if update:
+        with open(baseline_path, "w", encoding="utf-8") as baseline_file:
+            json.dump({"steps": steps}, baseline_file, indent=1)
+        return 0
+    try:
+        with open(baseline_path, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["steps"]
+    except OSError:
+        print(f"No baseline at {baseline_path}, run with --update-baseline to create one.")
+        return 0
+
+    regressions = compare(steps, baseline, threshold)
+    for name, seconds, before in regressions:
+        print(f"REGRESSION {name}: {1000*seconds:.2f} ms, was {1000*before:.2f} ms")
+    return 1 if regressions else 0
@@ -0,0 +1,69 @@
+"""
+Surface the solutions of questions are revealed on.
+"""
+
+import tkinter as tk
+
+from src.mediacache import REVEAL_SIZE
+from src.tracing import traced
+
+
+class RevealSurface:
+    """
+    One canvas for images and one native window for videos, created once and reused
+    for every reveal. Items and images are released when a reveal ends.
+    """
+    def __init__(self, parent):
+        self.parent = parent
+        width, height = REVEAL_SIZE
+        self.canvas = tk.Canvas(parent.window, bg="black", highlightthickness=0)
+        self.video = tk.Frame(parent.window, bg="black")
+        for widget in [self.canvas, self.video]:
+            parent.layout.add(widget, (1920-width)/2, 200, width, height)
+        self.images = []
+        self.shown = None
+
+    @traced
+    def show_image(self, background, foreground):
+        """
+        Show a blurred background with the image centered on it.
+        """
+        width, height = [int(size*self.parent.scale) for size in REVEAL_SIZE]
+        # keep references while shown, the cache may evict them meanwhile
+        self.images = [background, foreground]
+        self.canvas.create_image(0, 0, image=background, anchor=tk.NW)
+        self.canvas.create_image(int((width-foreground.width())/2),
+                                 int((height-foreground.height())/2),
+                                 image=foreground, anchor=tk.NW)
+        self.show(self.canvas)
+
+    def show_error(self):
+        """
+        Show the empty surface for a solution that could not be loaded.
+        """
+        self.show(self.canvas)
+
+    @traced
+    def show_video(self):
+        """
+        Show the video window and return it to attach a player to.
+        """
+        self.show(self.video)
+        return self.video
+
+    def show(self, widget):
+        """
+        Show one of the widgets of the surface.
+        """
+        self.shown = widget
+        self.parent.layout.show(widget)
+
+    def hide(self):
+        """
+        Hide the surface and release the items and images of the last reveal.
+        """
+        if self.shown:
+            self.parent.layout.hide(self.shown)
+            self.shown = None
+        self.canvas.delete("all")
+        self.images = []
@@ -4,83 +4,118 @@ Functionality that handles the scores at the bottom of the game.
 
 import tkinter as tk
 
+from src.tracing import traced
+
+POINTS_PER_BAR = 50
+MAX_BARS = 100
+BAR_WIDTH = 1355
+
 
 class PointHandler:
     """
     Class that handles point logic.
+
+    Each team has one fill rectangle that grows with its points. The bar
+    segments are drawn once on top of it and never change afterwards.
     """
     def __init__(self, parent):
         self.parent = parent
-        self.point_canvas = tk.Canvas(parent.window, width=int(1355*self.parent.scale),
-                                      height=int(82*self.parent.scale), bg="#ffffff")
-        self.points = self.create_points()
+        self.point_canvas = tk.Canvas(parent.window, bg="#ffffff")
+        self.parent.layout.place(self.point_canvas, 283, 959, 1355, 82)
+        self.num_points = 0
+        self.rendered = {"blue": 0, "red": 0}
+        self.points = {}
         self.score = self.create_score()
+        self.reset()
+        self.parent.layout.on_rescale(self.redraw)
+
+    def reset(self):
+        """
+        Draw the bars for the questions of all rounds of the current game.
+        """
+        self.num_points = 0
+        for questions in self.parent.game.engine.rounds:
+            for question_points in questions:
+                self.num_points += question_points*len(questions[question_points])
+        self.redraw()
 
     def create_points(self):
         """
         Create points at the bottom of the screen.
         """
+        scale = self.parent.scale
         points = {}
-        num_points = 0
-        for question_points in self.parent.game.questions:
-            for _ in self.parent.game.questions[question_points]:
-                num_points += question_points
-
-        num_bars = int(num_points/50)
-        width = (1355 - num_bars*3)/num_bars
-        for point_bar in range(num_bars):
-            x_start = int(((point_bar+1)*3+point_bar*width)*self.parent.scale)
-            x_end = int(((point_bar)*3+(point_bar+1)*width)*self.parent.scale)
-
-            rect = self.point_canvas.create_rectangle(x_start, int(self.parent.scale*5),
-                                                      x_end, int(self.parent.scale*77),
-                                                      outline="#5a5a5a", fill="#ffffff")
-
-            points[point_bar] = rect
-        self.point_canvas.place(x=self.parent.offset[0]+int(self.parent.scale*283),
-                                y=self.parent.offset[1]+int(self.parent.scale*959))
+        for team in ["blue", "red"]:
+            points[team] = self.point_canvas.create_rectangle(
+                0, int(scale*5), 0, int(scale*77), fill=team, width=0)
 
+        num_bars = -(-self.num_points//POINTS_PER_BAR)
+        if 0 < num_bars <= MAX_BARS:
+            width = (BAR_WIDTH - num_bars*3)/num_bars
+            x_gap = 0
+            for point_bar in range(num_bars):
+                x_start = int(((point_bar+1)*3+point_bar*width)*scale)
+                x_end = int(((point_bar)*3+(point_bar+1)*width)*scale)
+                if point_bar:
+                    # white gap to the previous bar so the team fills look segmented
+                    self.point_canvas.create_rectangle(x_gap, 0, x_start, int(scale*82),
+                                                       fill="#ffffff", width=0)
+                self.point_canvas.create_rectangle(x_start, int(scale*5), x_end, int(scale*77),
+                                                   outline="#5a5a5a")
+                x_gap = x_end
+        else:
+            self.point_canvas.create_rectangle(int(scale*3), int(scale*5),
+                                               int((BAR_WIDTH-3)*scale), int(scale*77),
+                                               outline="#5a5a5a")
         return points
 
+    def redraw(self):
+        """
+        Draw the bars again for a new scale.
+        """
+        self.point_canvas.delete("all")
+        self.points = self.create_points()
+        # draw fills and scores of both teams, even if they have no points yet
+        self.rendered = {"blue": None, "red": None}
+        self.set_points()
+
     def create_score(self):
         """
         Create text widgets with score.
         """
         blue = tk.Text(self.parent.window, height=1, width=4, font=self.parent.get_font(25),
                        bg="blue", borderwidth=0, highlightthickness=0)
-        blue.place(x=self.parent.offset[0]+int(190*self.parent.scale),
-                   y=self.parent.offset[1]+int(980*self.parent.scale))
+        self.parent.layout.place(blue, 190, 980)
         blue.insert(tk.END, "0")
         blue.config(state="disabled")
         red = tk.Text(self.parent.window, height=1, width=4, font=self.parent.get_font(25),
                       bg="red", borderwidth=0, highlightthickness=0)
-        red.place(x=self.parent.offset[0]+int(1650*self.parent.scale),
-                  y=self.parent.offset[1]+int(980*self.parent.scale))
+        self.parent.layout.place(red, 1650, 980)
         red.insert(tk.END, "0")
         red.config(state="disabled")
         return {"blue": blue, "red": red}
 
+    @traced
     def set_points(self):
         """
-        Change the colors according to the current score.
+        Update the fill and the score of every team whose points changed.
         """
-        blue = int(self.parent.game.players["blue"]/50)
-        red = int(self.parent.game.players["red"]/50)
-        for i in range(blue):
-            self.fill_rect(i, "blue")
+        scale = self.parent.scale
+        for team in ["blue", "red"]:
+            value = self.parent.game.players[team]
+            if value == self.rendered[team]:
+                continue
+            self.rendered[team] = value
 
-        num_points = len(self.points)
-        for i in range(red):
-            self.fill_rect(num_points-1-i, "red")
+            width = BAR_WIDTH*value/max(self.num_points, 1)
+            if team == "blue":
+                x_start, x_end = 0, width
+            else:
+                x_start, x_end = BAR_WIDTH - width, BAR_WIDTH
+            self.point_canvas.coords(self.points[team], int(x_start*scale), int(scale*5),
+                                     int(x_end*scale), int(scale*77))
 
-        for team in ["blue", "red"]:
             self.score[team].config(state="normal")
             self.score[team].delete("1.0", tk.END)
-            self.score[team].insert(tk.END, self.parent.game.players[team])
+            self.score[team].insert(tk.END, value)
             self.score[team].config(state="disabled")
-
-    def fill_rect(self, rect, color):
-        """
-        Fill a rectengle with the desired color.
-        """
-        self.point_canvas.itemconfig(self.points[rect], fill=color)
@@ -0,0 +1,250 @@
+"""
+Server that hosts many independent quiz rooms on one asyncio event loop.
+
+Clients send one json object per line and get one json line back, containing
+the result of the command and the new state of their room. Parsed quizzes are
+loaded once and shared by all rooms playing them.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+from collections import deque
+
+if os.name != 'nt': # not available on Windows
+    import resource
+
+from src.client import HOST, PORT, LATENCY_SAMPLES
+from src.engine import GameEngine, CORRECT, tiles
+from src.quizfile import load_rounds
+
+
+class Room:
+    """
+    One game session with the clients that display it.
+    """
+    def __init__(self, name, quiz, rounds):
+        self.name = name
+        self.quiz = quiz
+        self.engine = GameEngine(rounds)
+        self.clients = set()
+        self.latency = deque(maxlen=LATENCY_SAMPLES)
+        self.commands = 0
+
+    def state(self):
+        """
+        Return the state of the room for the clients.
+        """
+        state = self.engine.snapshot()
+        state["answers"] = self.engine.question.answers if self.engine.question else None
+        state["round_over"] = self.engine.round_over()
+        state["finished"] = self.engine.finished()
+        state["winner"] = self.engine.winner()
+        return state
+
+    def stats(self):
+        """
+        Return latency in ms, command count, clients and memory used by the room.
+        """
+        latency = sorted(self.latency) or [0]
+        return {"quiz": self.quiz, "clients": len(self.clients), "commands": self.commands,
+                "latency_p50": 1000*latency[len(latency)//2],
+                "latency_p95": 1000*latency[int(len(latency)*0.95)],
+                "latency_max": 1000*latency[-1],
+                "memory": deep_size(self.engine.snapshot()) + deep_size(list(self.latency))}
+
+
+class QuizServer:
+    """
+    Hosts the rooms and shares the parsed quizzes between them.
+    """
+    def __init__(self):
+        self.rooms = {}
+        self.quizzes = {}
+
+    def rounds(self, quiz):
+        """
+        Return the parsed questions of every round of a quiz, loading it only once.
+        """
+        if quiz not in self.quizzes:
+            self.quizzes[quiz] = [questions for _, questions in load_rounds(quiz)]
+        return self.quizzes[quiz]
+
+    def join(self, name, quiz):
+        """
+        Return the room with the given name, opening it if needed.
+        """
+        room = self.rooms.get(name)
+        if room is None:
+            room = Room(name, quiz, self.rounds(quiz))
+            self.rooms[name] = room
+        elif room.quiz != quiz:
+            raise ValueError(f"room {name} is playing {room.quiz}")
+        return room
+
+    async def serve(self, host=HOST, port=PORT):
+        """
+        Accept clients until the process is stopped.
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Quiz server listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    async def handle(self, reader, writer):
+        """
+        Answer the requests of one client.
+        """
+        room = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                try:
+                    response, room = self.dispatch(json.loads(line), room, writer)
+                except (ValueError, KeyError, TypeError, IndexError, OSError) as error:
+                    response = {"ok": False, "error": str(error)}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+                if room:
+                    room.latency.append(time.perf_counter() - start)
+        except ConnectionError:
+            pass
+        finally:
+            if room:
+                room.clients.discard(writer)
+            writer.close()
+
+    def dispatch(self, request, room, writer):
+        """
+        Execute a request and return the response and the room of the client.
+        """
+        command = request["cmd"]
+        if command == "join":
+            if room:
+                room.clients.discard(writer)
+            room = self.join(request["room"], request["quiz"])
+            room.clients.add(writer)
+            return {"ok": True, "result": None, "state": room.state()}, room
+        if command == "stats":
+            return {"ok": True, "result": self.stats()}, room
+        if room is None:
+            raise KeyError("join a room first")
+
+        room.commands += 1
+        engine = room.engine
+        if command == "pick":
+            result = engine.pick(request["num"], request["points"], request["i"]) is not None
+        elif command == "buzz":
+            result = engine.buzz(request["team"])
+        elif command == "answer":
+            result = engine.select_answer(request["nr"])
+        elif command == "finish":
+            result = engine.finish_question() if engine.question else None
+        elif command == "round":
+            result = engine.next_round()
+        elif command == "reset":
+            result = engine.reset()
+        elif command == "state":
+            result = None
+        else:
+            raise KeyError(f"unknown command {command}")
+        return {"ok": True, "result": result, "state": room.state()}, room
+
+    def stats(self):
+        """
+        Return the statistics of all rooms and the shared quizzes.
+        """
+        return {"rooms": {name: room.stats() for name, room in self.rooms.items()},
+                "quizzes": {quiz: sum(len(questions[points]) for questions in rounds
+                                      for points in questions)
+                            for quiz, rounds in self.quizzes.items()},
+                "max_rss": max_rss()}
+
+
+async def play_room(address, room, quiz, games, rng):
+    """
+    Play randomized games in a room like a display client and return the request times.
+    """
+    reader, writer = await asyncio.open_connection(*address)
+    times = []
+
+    async def request(message):
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        times.append(time.perf_counter() - start)
+        return response
+
+    await request({"cmd": "join", "room": room, "quiz": quiz})
+    boards = [list(tiles(questions)) for _, questions in load_rounds(quiz)]
+    for _ in range(games):
+        await request({"cmd": "reset"})
+        for index, board in enumerate(boards):
+            if index:
+                await request({"cmd": "round"})
+            rng.shuffle(board)
+            for num, points, i in board:
+                response = await request({"cmd": "pick", "num": num, "points": points, "i": i})
+                if not response["result"]:
+                    continue
+                for a_nr in rng.sample(range(4), 4):
+                    await request({"cmd": "answer", "nr": a_nr})
+                    response = await request({"cmd": "answer", "nr": a_nr})
+                    if response["result"] == CORRECT:
+                        break
+                await request({"cmd": "finish"})
+    writer.close()
+    return times
+
+
+async def load_test(address, quiz, rooms=24, games=5, seed=None):
+    """
+    Play in many rooms at once and return the latency of all requests.
+    """
+    rng = random.Random(seed)
+    results = await asyncio.gather(*[
+        play_room(address, f"load{room}", quiz, games, random.Random(rng.random()))
+        for room in range(rooms)])
+    return sorted(request for times in results for request in times)
+
+
+def deep_size(obj, seen=None):
+    """
+    Estimate the memory used by an object and everything it contains.
+    """
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, deque)):
+        size += sum(deep_size(item, seen) for item in obj)
+    return size
+
+
+def max_rss():
+    """
+    Return the peak memory of the process in kB, if the platform reports it.
+    """
+    if os.name == 'nt': # Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_server(host=HOST, port=PORT):
+    """
+    Run a quiz server in the current thread.
+    """
+    try:
+        asyncio.run(QuizServer().serve(host, port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,79 @@
+"""
+Simulation of many randomized games to balance quizzes and test the rules without a display.
+"""
+
+import time
+import random
+
+from src.engine import GameEngine, CORRECT, tiles
+
+
+def simulate(questions, games=1000, skill=(0.5, 0.5), seed=None):
+    """
+    Play randomized games and return statistics about teams and point categories.
+    skill is the chance of the blue and the red team to choose the correct answer.
+    """
+    rng = random.Random(seed)
+    engine = GameEngine(questions)
+    board = list(tiles(questions))
+    solutions = {(points, i): questions[points][i].answers.index(questions[points][i].solution)
+                 for _, points, i in board}
+    chance = {"blue": skill[0], "red": skill[1]}
+    report = {"games": games, "wins": {"blue": 0, "red": 0, "draw": 0}, "margin": 0,
+              "categories": {points: {"questions": len(questions[points]), "first_try": 0,
+                                      "guesses": 0, "swing": 0}
+                             for points in questions}}
+
+    start = time.perf_counter()
+    for _ in range(games):
+        engine.reset()
+        rng.shuffle(board)
+        swing = dict.fromkeys(questions, 0)
+        for num, points, i in board:
+            engine.pick(num, points, i)
+            picking_team = engine.active_team
+            wrong = [a_nr for a_nr in range(4) if a_nr != solutions[(points, i)]]
+            rng.shuffle(wrong)
+            while True:
+                if not wrong or rng.random() < chance[engine.active_team]:
+                    a_nr = solutions[(points, i)]
+                else:
+                    a_nr = wrong.pop()
+                engine.select_answer(a_nr)
+                report["categories"][points]["guesses"] += 1
+                if engine.select_answer(a_nr) == CORRECT:
+                    break
+            team = engine.finish_question()
+            if team == picking_team:
+                report["categories"][points]["first_try"] += 1
+            swing[points] += points if team == "blue" else -points
+
+        report["wins"][engine.winner() or "draw"] += 1
+        report["margin"] += abs(engine.players["blue"] - engine.players["red"])
+        for points in swing:
+            report["categories"][points]["swing"] += abs(swing[points])
+
+    report["seconds"] = time.perf_counter() - start
+    report["margin"] /= games
+    for points, category in report["categories"].items():
+        asked = max(1, category["questions"]*games)
+        category["first_try"] /= asked
+        category["guesses"] /= asked
+        category["swing"] /= games
+    return report
+
+
+def print_report(report):
+    """
+    Print the result of a simulation.
+    """
+    games = report["games"]
+    print(f"{games} games in {report['seconds']:.2f} s "
+          f"({games/max(report['seconds'], 1e-9):.0f} games/s)")
+    for team, wins in report["wins"].items():
+        print(f"{team:>5}: {100*wins/games:5.1f} %")
+    print(f"average margin: {report['margin']:.1f} points")
+    print("points  questions  first try  guesses  swing")
+    for points, category in report["categories"].items():
+        print(f"{points:>6}  {category['questions']:>9}  {100*category['first_try']:8.1f}%"
+              f"  {category['guesses']:7.2f}  {category['swing']:5.0f}")
@@ -0,0 +1,79 @@
+"""
+Profile of the time it takes until the first screen appears.
+"""
+
+import sys
+import time
+import subprocess
+
+IMPORT_LIMIT = 15
+
+
+class StartupProfile:
+    """
+    Collects the duration of the startup steps when enabled.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.steps = []
+
+    def enable(self, start):
+        """
+        Start recording, start is the perf_counter value the program started at.
+        """
+        self.enabled = True
+        self.start = start
+        self.last = start
+
+    def step(self, name):
+        """
+        Record the time since the previous step.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last))
+        self.last = now
+
+    def report(self, backends):
+        """
+        Print the import times per module and the startup steps.
+        backends maps the names of media backends to their load time or None while loading.
+        """
+        print("import time per module (self, in a separate interpreter):")
+        imports = measure_imports()
+        for name, seconds in imports[:IMPORT_LIMIT]:
+            print(f"  {name:30} {1000*seconds:8.1f} ms")
+        print(f"  {'total':30} {1000*sum(s for _, s in imports):8.1f} ms")
+        print("startup steps:")
+        for name, seconds in self.steps:
+            print(f"  {name:30} {1000*seconds:8.1f} ms")
+        print(f"  {'first screen after':30} {1000*(self.last - self.start):8.1f} ms")
+        print("background:")
+        for name, seconds in backends.items():
+            state = "still loading" if seconds is None else f"{1000*seconds:8.1f} ms"
+            print(f"  {name:30} {state}")
+
+
+def measure_imports(module="quiz_wall"):
+    """
+    Import a module with -X importtime in a new interpreter and return the
+    self time per module of the game and per package of other libraries.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=False)
+    totals = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if not name.startswith("src.") and name != module:
+            name = name.split(".")[0]
+        totals[name] = totals.get(name, 0) + int(own)/1e6
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+STARTUP = StartupProfile()
@@ -0,0 +1,97 @@
+"""
+Fitting texts into boxes by choosing the largest font size that fits.
+"""
+
+MIN_SIZE = 10
+
+
+class TextFitter:
+    """
+    Finds the largest font size at which a text wrapped like tkinter wraps it fits a box.
+    Widths of words are measured once per font, size and text, fitted sizes are
+    kept until the scale changes.
+    """
+    def __init__(self, layout):
+        self.layout = layout
+        self.widths = {}
+        self.line_heights = {}
+        self.fitted = {}
+        layout.on_rescale(self.fitted.clear)
+
+    def measure(self, size, text):
+        """
+        Return the width of a text in pixels for a font size in design space.
+        """
+        key = (self.layout.family, int(size*self.layout.scale), text)
+        width = self.widths.get(key)
+        if width is None:
+            width = self.layout.font(size).measure(text)
+            self.widths[key] = width
+        return width
+
+    def line_height(self, size):
+        """
+        Return the height of a line in pixels for a font size in design space.
+        """
+        key = (self.layout.family, int(size*self.layout.scale))
+        height = self.line_heights.get(key)
+        if height is None:
+            height = self.layout.font(size).metrics("linespace")
+            self.line_heights[key] = height
+        return height
+
+    def lines(self, text, size, width):
+        """
+        Return the number of lines a text is wrapped into at width pixels,
+        or None if a single word is wider than that.
+        """
+        space = self.measure(size, " ")
+        count = 0
+        for paragraph in text.split("\n"):
+            count += 1
+            used = 0
+            for word in paragraph.split():
+                word_width = self.measure(size, word)
+                if word_width > width:
+                    return None
+                if used and used + space + word_width > width:
+                    count += 1
+                    used = word_width
+                else:
+                    used += word_width + (space if used else 0)
+        return count
+
+    def fits(self, text, size, width, height):
+        """
+        Return whether a text fits width and height in pixels at a font size.
+        """
+        lines = self.lines(text, size, width)
+        return lines is not None and lines*self.line_height(size) <= height
+
+    def fit(self, text, box, largest, smallest=MIN_SIZE):
+        """
+        Return the largest font size between smallest and largest at which text fits
+        box, given as width and height in design space. Texts that do not even fit
+        at the smallest size get the smallest size.
+        """
+        key = (text, box, largest)
+        size = self.fitted.get(key)
+        if size is not None:
+            return size
+
+        width = int(box[0]*self.layout.scale)
+        height = int(box[1]*self.layout.scale)
+        size = smallest
+        if self.fits(text, largest, width, height):
+            size = largest
+        else:
+            low, high = smallest, largest - 1
+            while low <= high:
+                middle = (low + high)//2
+                if self.fits(text, middle, width, height):
+                    size = middle
+                    low = middle + 1
+                else:
+                    high = middle - 1
+        self.fitted[key] = size
+        return size
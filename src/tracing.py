@@ -0,0 +1,150 @@
+"""
+Opt-in tracing of the game in the Chrome trace event format.
+
+Tracing is switched on by setting QUIZ_WALL_TRACE to the path of the trace file
+before the game starts. Functions are wrapped by traced when their module is
+imported, so without tracing they stay untouched and cost nothing. The trace
+can be opened in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from functools import wraps
+
+TRACE_VARIABLE = "QUIZ_WALL_TRACE"
+FLUSH_EVERY = 1000
+LAG_INTERVAL = 50
+LAG_THRESHOLD = 2
+
+
+class Tracer:
+    """
+    Collects trace events and appends them to the trace file in batches.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.enabled = bool(path)
+        self.events = []
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.started = False
+        if self.enabled:
+            atexit.register(self.flush)
+
+    def timestamp(self, seconds):
+        """
+        Return a perf_counter time in microseconds as used by trace events.
+        """
+        return round(seconds*1000000, 1)
+
+    def complete(self, name, start, end, args=None):
+        """
+        Record a span from start to end, given in perf_counter seconds.
+        """
+        event = {"name": name, "ph": "X", "ts": self.timestamp(start),
+                 "dur": self.timestamp(end - start), "pid": self.pid,
+                 "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        self.add(event)
+
+    def instant(self, name, args=None):
+        """
+        Record a point in time, like an event arriving from vlc.
+        """
+        event = {"name": name, "ph": "i", "s": "t", "ts": self.timestamp(time.perf_counter()),
+                 "pid": self.pid, "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        self.add(event)
+
+    def counter(self, name, values):
+        """
+        Record the values of a counter, they are drawn as a graph.
+        """
+        self.add({"name": name, "ph": "C", "ts": self.timestamp(time.perf_counter()),
+                  "pid": self.pid, "args": values})
+
+    def add(self, event):
+        """
+        Queue an event and write the queue when it is long enough.
+        """
+        with self.lock:
+            self.events.append(event)
+            full = len(self.events) >= FLUSH_EVERY
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+        Append the queued events to the trace file. The closing bracket of the
+        json array is left out, which the trace viewers accept, so the file can
+        be appended to and stays readable if the program is killed.
+        """
+        with self.lock:
+            events, self.events = self.events, []
+            if not events and self.started:
+                return
+            with open(self.path, "a" if self.started else "w", encoding="utf-8") as trace:
+                if not self.started:
+                    trace.write("[\n")
+                    self.started = True
+                trace.write("".join(json.dumps(event) + ",\n" for event in events))
+
+
+def traced(function):
+    """
+    Record a span for every call of function if tracing is enabled.
+    """
+    if not TRACER.enabled:
+        return function
+    name = function.__qualname__
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            TRACER.complete(name, start, time.perf_counter())
+    return wrapper
+
+
+class LagMonitor:
+    """
+    Measures how late the Tk event loop runs a callback that is due every interval ms.
+    """
+    def __init__(self, window, interval=LAG_INTERVAL, threshold=LAG_THRESHOLD):
+        # bound now, a replay makes the game's own delays of the window instant
+        self.after = window.after
+        self.interval = interval
+        self.threshold = threshold
+        self.lagging = False
+        self.due = None
+
+    def start(self):
+        """
+        Start measuring.
+        """
+        self.due = time.perf_counter() + self.interval/1000
+        self.after(self.interval, self.tick)
+
+    def tick(self):
+        """
+        Record the lag of this call. Only lags above the threshold and the
+        return to no lag are recorded, to keep long traces small.
+        """
+        now = time.perf_counter()
+        lag = max(0, 1000*(now - self.due))
+        if lag >= self.threshold or self.lagging:
+            TRACER.counter("event loop lag", {"ms": round(lag, 1)})
+            self.lagging = lag >= self.threshold
+        self.due = now + self.interval/1000
+        self.after(self.interval, self.tick)
+
+
+# removed from the environment, so worker processes do not write to the same file
+TRACER = Tracer(os.environ.pop(TRACE_VARIABLE, None))
@@ -0,0 +1,73 @@
+"""
+Waking the tkinter thread from other threads without calling into tkinter there.
+"""
+
+import os
+import threading
+import tkinter
+
+
+class Wakeup:
+    """
+    Calls callback on the tkinter thread after wake was called from another thread.
+
+    Where tkinter can watch files, wake writes a byte to a pipe and the tkinter
+    thread only wakes up then. Elsewhere, like on Windows, the tkinter thread
+    checks a flag every interval ms from watch on, as long as busy returns True.
+    """
+    def __init__(self, window, callback, interval, busy):
+        self.window = window
+        self.callback = callback
+        self.interval = interval
+        self.busy = busy
+        self.woken = threading.Event()
+        self.polling = False
+        self.pipe = None
+        if os.name != "nt" and hasattr(window.tk, "createfilehandler"):
+            self.pipe = os.pipe()
+            for end in self.pipe:
+                os.set_blocking(end, False)
+            window.tk.createfilehandler(self.pipe[0], tkinter.READABLE, self.readable)
+
+    def wake(self):
+        """
+        Let the tkinter thread call callback. Can be called from any thread.
+        """
+        if self.pipe:
+            try:
+                os.write(self.pipe[1], b"\0")
+            except BlockingIOError: # the pipe is full, the tkinter thread wakes up anyway
+                pass
+        else:
+            self.woken.set()
+
+    def readable(self, pipe, _):
+        """
+        Empty the pipe and call callback, called by tkinter.
+        """
+        try:
+            while os.read(pipe, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        self.callback()
+
+    def watch(self):
+        """
+        Start checking for wakeups if there is no pipe. Called on the tkinter thread.
+        """
+        if not self.pipe and not self.polling:
+            self.polling = True
+            self.window.after(self.interval, self.poll)
+
+    def poll(self):
+        """
+        Call callback if wake was called and check again while busy.
+        """
+        if self.woken.is_set():
+            self.woken.clear()
+            self.callback()
+        if self.busy():
+            self.window.after(self.interval, self.poll)
+        else:
+            self.polling = False